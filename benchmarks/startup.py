@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Startup benchmark for the gisrep command line tool
+
+Runs each subcommand under 'python -X importtime', reports the time spent
+importing modules (beyond those imported by the interpreter itself) and fails
+if a subcommand exceeds its threshold or imports a dependency it should not.
+
+Usage:
+    python benchmarks/startup.py [--json] [--repeat N]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+# Subcommand arguments, maximum import time (ms) and forbidden modules
+COMMANDS = [
+    (['--help'], 100, ['github', 'keyring', 'requests', 'jinja2']),
+    (['templates'], 150, ['github', 'keyring', 'requests']),
+    (['init', '--help'], 100, ['github', 'keyring', 'requests', 'jinja2']),
+    (['report', '--help'], 100, ['github', 'keyring', 'requests', 'jinja2']),
+]
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+RUN_GISREP = (
+    "import sys; sys.argv = ['gisrep'] + sys.argv[1:]; "
+    "from gisrep.gisrep import main; main()")
+
+
+def import_times(args):
+    """Runs python with import timing enabled
+
+    Args:
+        args (list): Arguments passed to python after '-X importtime'
+
+    Returns:
+        dict: Cumulative import time (us) of each top-level module
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True)
+    times = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if len(match.group(3)) == 1:
+            # Module was imported directly, rather than by another module
+            times[match.group(4)] = int(match.group(2))
+    return times, modules
+
+
+def measure(command, repeat):
+    """Measures the import time of a subcommand
+
+    Args:
+        command (list): Arguments passed to gisrep
+        repeat (int): Number of runs, of which the fastest is reported
+
+    Returns:
+        tuple: Import time (ms) and the set of imported modules
+    """
+    baseline, _ = import_times(['-c', 'pass'])
+    best = None
+    modules = set()
+    for _ in range(repeat):
+        times, modules = import_times(['-c', RUN_GISREP] + command)
+        total = sum(
+            time for module, time in times.items()
+            if module not in baseline) / 1000
+        best = total if best is None else min(best, total)
+    return best, modules
+
+
+def main():
+    """Runs the benchmark
+
+    Returns:
+        int: Exit code, non-zero if any threshold was exceeded
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--json', action='store_true', help="Output JSON")
+    parser.add_argument(
+        '--repeat', type=int, default=5, help="Runs per subcommand")
+    args = parser.parse_args()
+
+    results = []
+    for command, threshold, forbidden in COMMANDS:
+        import_ms, modules = measure(command, args.repeat)
+        imported = sorted(
+            name for name in forbidden
+            if name in modules)
+        results.append({
+            'command': ' '.join(command),
+            'import_ms': round(import_ms, 1),
+            'threshold_ms': threshold,
+            'forbidden_imports': imported,
+            'passed': import_ms <= threshold and not imported,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print("{:<16} {:>7.1f} ms (max {} ms) {}{}".format(
+                result['command'],
+                result['import_ms'],
+                result['threshold_ms'],
+                "ok" if result['passed'] else "FAILED",
+                "".join(
+                    " imports " + name
+                    for name in result['forbidden_imports'])))
+
+    return 0 if all(result['passed'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
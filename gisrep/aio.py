@@ -0,0 +1,164 @@
+"""
+Asynchronous engine fetching and rendering a report concurrently
+
+Pages of search results, and the expansions of their issues, are fetched
+concurrently while an asynchronous template renders the issues that have
+already arrived, so rendering overlaps with network I/O. Requests are made
+by the usual client in a pool of threads, so that they share its
+connections, cache and rate limiter.
+
+Attributes:
+    DEFAULT_REQUESTS (int): Default number of requests made concurrently
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
+from .client import DEFAULT_POOL_SIZE
+from .expansion import fetch_expansion
+
+DEFAULT_REQUESTS = DEFAULT_POOL_SIZE
+
+
+class AsyncClient(object):
+
+    """Asynchronous wrapper of a GithubClient
+
+    Attributes:
+        client (GithubClient): Client making the requests
+    """
+
+    def __init__(self, client, requests=DEFAULT_REQUESTS):
+        """Creates the pool of threads making requests
+
+        Args:
+            client (GithubClient): Client making the requests
+            requests (int, optional): Number of requests made concurrently
+        """
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=requests)
+
+    async def run(self, function, *args):
+        """Calls a blocking function in the pool of threads
+
+        Args:
+            function (function): The function
+            *args: Arguments of the function
+
+        Returns:
+            object: Value returned by the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args))
+
+    async def get(self, path, params=None):
+        """Makes a GET request to the API
+
+        Args:
+            path (str): Path of the resource, relative to the API URL
+            params (dict, optional): Query parameters
+
+        Returns:
+            object: Decoded JSON body of the response
+        """
+        return await self.run(self.client.get, path, params)
+
+    def close(self):
+        """Waits for the pool of threads to finish
+        """
+        self._executor.shutdown()
+
+
+async def expand(client, items, names):
+    """Adds expansions to a page of issues, fetching them concurrently
+
+    Args:
+        client (AsyncClient): Client used to make requests
+        items (list): Raw issues, updated in place
+        names (list): Names of the expansions
+    """
+    targets = [(item, name) for item in items for name in names]
+    resources = await asyncio.gather(*[
+        client.run(fetch_expansion, client.client, item, name)
+        for item, name in targets])
+    for (item, name), value in zip(targets, resources):
+        item[name] = value
+
+
+async def fetch_items(client, search, projection, window):
+    """Fetches search results, and the attributes a template needs
+
+    Pages are fetched ahead of the page being yielded, but are still
+    yielded in order.
+
+    Args:
+        client (AsyncClient): Client used to make requests
+        search (ShardedSearch): The search
+        projection (Projection): Issue attributes required by the template
+        window (int): Number of pages fetched ahead
+
+    Yields:
+        dict: Raw issues, as they are fetched
+    """
+
+    async def fetch_page(shard, page):
+        if page == 1:
+            response = await client.run(shard.first_page)
+        else:
+            response = await client.run(shard.get_page, page)
+        items = response['items']
+        await client.run(projection.complete, client.client, items)
+        await expand(client, items, projection.expansions)
+        return items
+
+    pending = deque()
+    try:
+        for shard in await client.run(search.shards):
+            page_count = await client.run(getattr, shard, 'page_count')
+            for page in range(1, page_count + 1):
+                pending.append(asyncio.ensure_future(fetch_page(shard, page)))
+                if len(pending) > window:
+                    for item in await pending.popleft():
+                        yield item
+
+        while pending:
+            for item in await pending.popleft():
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _publish(  # pylint: disable=too-many-arguments
+        builder, template_tag, client, search, projection, create_issue,
+        output, window):
+    async_client = AsyncClient(client)
+    try:
+        items = fetch_items(async_client, search, projection, window)
+        issues = (create_issue(item) async for item in items)
+        async for chunk in builder.stream_async(template_tag, issues):
+            output.write(chunk)
+    finally:
+        async_client.close()
+
+
+def publish(  # pylint: disable=too-many-arguments
+        builder, template_tag, client, search, projection, create_issue,
+        output, window):
+    """Publishes a report, rendering it while its issues are fetched
+
+    Args:
+        builder (TemplateManager): Asynchronous template manager
+        template_tag (str): Tag of the template
+        client (GithubClient): Client used to make requests
+        search (ShardedSearch): The search
+        projection (Projection): Issue attributes required by the template
+        create_issue (function): Function creating an issue from a result
+        output (file): File to write the report to
+        window (int): Number of pages fetched ahead
+    """
+    asyncio.run(_publish(
+        builder, template_tag, client, search, projection, create_issue,
+        output, window))
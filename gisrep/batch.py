@@ -0,0 +1,73 @@
+"""
+Manifests of reports published together by the batch command
+
+A manifest is a TOML file with a [[report]] table for each report:
+
+    [[report]]
+    query = "repo:briggySmalls/gisrep milestone:v1.0"
+    internal = "list_by_labels.html"
+    output = "v1.0.html"
+
+Relative 'external' template and 'output' paths are relative to the manifest.
+"""
+from collections import namedtuple
+import os
+
+import toml
+
+from .errors import GisrepError
+
+Job = namedtuple('Job', ['query', 'internal', 'external', 'output'])
+Job.__doc__ = """Report listed in a manifest
+
+Attributes:
+    query (str): The Github search query
+    internal (str): Tag of an internal template, or None
+    external (str): Path of an external template, or None
+    output (str): Path of the file to write the report to
+"""
+
+
+def read_manifest(path):
+    """Reads the reports listed in a manifest
+
+    Args:
+        path (str): Path of the manifest file
+
+    Returns:
+        list: Job for each report
+
+    Raises:
+        GisrepError: The manifest is invalid
+    """
+    try:
+        manifest = toml.load(path)
+    except (OSError, ValueError) as exc:
+        raise GisrepError("Couldn't read manifest: {}".format(exc))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    reports = manifest.get('report')
+    if not reports:
+        raise GisrepError("Manifest doesn't list any [[report]]s")
+
+    jobs = []
+    for index, report in enumerate(reports, 1):
+        if 'query' not in report or 'output' not in report:
+            raise GisrepError(
+                "Report {} must have a 'query' and an 'output'".format(index))
+        if 'internal' in report and 'external' in report:
+            raise GisrepError(
+                "Report {} may only have one of 'internal'/'external'".format(
+                    index))
+
+        external = report.get('external')
+        jobs.append(Job(
+            query=report['query'],
+            internal=report.get('internal'),
+            external=(
+                os.path.join(directory, external)
+                if external is not None else
+                None),
+            output=os.path.join(directory, report['output'])))
+
+    return jobs
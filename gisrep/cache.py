@@ -0,0 +1,126 @@
+"""
+On-disk cache of Github API responses
+
+Responses are stored alongside their validators (ETag and Last-Modified) so
+that they may be revalidated with a conditional request. Entries are evicted
+in least-recently-used order once the cache grows beyond its size limit.
+
+Attributes:
+    DEFAULT_CACHE_DIR (str): Default directory for gisrep caches
+    DEFAULT_CACHE_SIZE (int): Default maximum size of the response cache, in
+        bytes
+    RESPONSES_DIR (str): Name of the response cache within a cache directory
+"""
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gisrep")
+DEFAULT_CACHE_SIZE = 50 * 1024 * 1024
+RESPONSES_DIR = "responses"
+ENTRY_EXTENSION = '.json'
+
+
+class ResponseCache(object):
+
+    """Cache of API responses, persisted as one file per entry
+
+    Attributes:
+        directory (str): Directory holding the cache entries
+        max_size (int): Maximum total size of the entries, in bytes
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(url, params=None, username=None):
+        """Creates the key identifying a request
+
+        Args:
+            url (str): URL of the request
+            params (dict, optional): Query parameters of the request
+            username (str, optional): User making the request
+
+        Returns:
+            str: Key of the request
+        """
+        request = json.dumps(
+            [url, sorted((params or {}).items()), username])
+        return hashlib.sha1(request.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Gets a cached response, marking it as recently used
+
+        Args:
+            key (str): Key of the request
+
+        Returns:
+            dict: The cached entry, with 'etag', 'last_modified' and 'data'
+                items, or None if the request has not been cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        # Record the access for LRU eviction
+        os.utime(path, None)
+        return entry
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """Stores a response in the cache
+
+        Args:
+            key (str): Key of the request
+            data (object): Decoded JSON body of the response
+            etag (str, optional): ETag header of the response
+            last_modified (str, optional): Last-Modified header of the response
+        """
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data,
+        }
+
+        # Write to a temporary file first so readers never see partial entries
+        path = self._path(key)
+        temp_path = "{}.{}.{}.tmp".format(
+            path, os.getpid(), threading.get_ident())
+        with open(temp_path, 'w') as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(temp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Removes least-recently-used entries until the cache fits its limit
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_EXTENSION)
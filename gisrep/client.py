@@ -0,0 +1,205 @@
+"""
+Minimal client for the Github REST API
+
+Attributes:
+    DEFAULT_API_URL (str): Base URL of the Github API
+    DEFAULT_POOL_SIZE (int): Default number of connections kept open
+    MEDIA_TYPE (str): Media type requested from the Github API
+"""
+import requests
+
+from .errors import ApiError, GisrepError
+from .ratelimit import is_throttled
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_POOL_SIZE = 10
+MEDIA_TYPE = "application/vnd.github.v3+json"
+GRAPHQL_PATH = "/graphql"
+USER_AGENT = "gisrep"
+
+
+class GithubClient(object):
+
+    """Client making authenticated requests to the Github API
+
+    Responses are revalidated against a response cache, when one is supplied,
+    so that unchanged resources are not downloaded (or charged against the
+    rate limit) twice.
+
+    Requests are scheduled by a rate limiter, when one is supplied, and
+    requests that are throttled are retried once the limit allows, so that
+    a report's pagination continues where it left off.
+
+    Attributes:
+        api_url (str): Base URL of the Github API
+        cache (ResponseCache): Cache of responses, or None
+        limiter (RateLimiter): Scheduler of requests, or None
+        username (str): Authenticated user, or None
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, credentials=None, cache=None, api_url=DEFAULT_API_URL,
+            pool_size=DEFAULT_POOL_SIZE, limiter=None):
+        self.api_url = api_url.rstrip('/')
+        self.cache = cache
+        self.limiter = limiter
+        self.username = None
+
+        # Keep connections open for reuse by concurrent requests
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({
+            'Accept': MEDIA_TYPE,
+            'User-Agent': USER_AGENT,
+        })
+        if credentials is not None:
+            self.username = credentials['username']
+            self._session.auth = (
+                credentials['username'],
+                credentials['password'])
+
+    def get(self, path, params=None):
+        """Makes a GET request to the API
+
+        Args:
+            path (str): Path of the resource, relative to the API URL
+            params (dict, optional): Query parameters
+
+        Returns:
+            object: Decoded JSON body of the response
+
+        Raises:
+            ApiError: The API returned an error
+        """
+        url = self.api_url + path
+
+        # Make the request conditional if we have seen it before
+        headers = {}
+        entry = None
+        if self.cache is not None:
+            key = self.cache.key(url, params, self.username)
+            entry = self.cache.get(key)
+            if entry is not None:
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send(
+            _resource(path), self._session.get,
+            url, params=params, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            # Resource is unchanged
+            return entry['data']
+        if response.status_code >= 400:
+            raise ApiError(
+                response.status_code,
+                _error_message(response),
+                response.headers)
+
+        data = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if self.cache is not None and (etag or last_modified):
+            self.cache.put(key, data, etag, last_modified)
+        return data
+
+    def graphql(self, query, variables=None):
+        """Makes a query to the GraphQL API
+
+        Args:
+            query (str): The GraphQL query
+            variables (dict, optional): Variables of the query
+
+        Returns:
+            dict: The 'data' of the response
+
+        Raises:
+            ApiError: The API returned an error
+            GisrepError: The client is not authenticated
+        """
+        if self.username is None:
+            raise GisrepError(
+                "Github credentials are required to fetch these attributes")
+
+        response = self._send(
+            'graphql', self._session.post,
+            self.api_url + GRAPHQL_PATH,
+            json={'query': query, 'variables': variables or {}})
+
+        if response.status_code >= 400:
+            raise ApiError(
+                response.status_code,
+                _error_message(response),
+                response.headers)
+
+        body = response.json()
+        if body.get('errors'):
+            raise ApiError(
+                response.status_code,
+                "; ".join(error['message'] for error in body['errors']),
+                response.headers)
+        return body['data']
+
+    def _send(self, resource, method, url, **kwargs):
+        """Sends a request when the rate limit allows, retrying it if it is
+        throttled
+
+        Args:
+            resource (str): The API resource, e.g. 'search'
+            method (function): Session method making the request
+            url (str): Request URL
+            **kwargs: Arguments of the request
+
+        Returns:
+            requests.Response: The response (throttled, if retries ran out)
+        """
+        if self.limiter is None:
+            return method(url, **kwargs)
+
+        attempt = 0
+        while True:
+            self.limiter.acquire(resource)
+            response = method(url, **kwargs)
+            self.limiter.update(resource, response.headers)
+
+            if (attempt >= self.limiter.retries or not is_throttled(
+                    response.status_code, response.headers,
+                    _error_message(response)
+                    if response.status_code == 403 else "")):
+                return response
+
+            # Wait for the limit to allow the request again
+            self.limiter.backoff(resource, attempt, response.headers)
+            attempt += 1
+
+
+def _resource(path):
+    """Gets the rate limited API resource a path belongs to
+
+    Args:
+        path (str): Path of the resource, relative to the API URL
+
+    Returns:
+        str: The API resource
+    """
+    return 'search' if path.startswith('/search/') else 'core'
+
+
+def _error_message(response):
+    """Extracts the error message from an API error response
+
+    Args:
+        response (requests.Response): The error response
+
+    Returns:
+        str: The error message
+    """
+    try:
+        return response.json()['message']
+    except (ValueError, KeyError, TypeError):
+        return response.reason
@@ -7,3 +7,17 @@ class GisrepError(Exception):
     """Base class for gisrep errors
     """
     pass
+
+
+class ApiError(GisrepError):
+    """Error response returned by the Github API
+
+    Attributes:
+        status (int): HTTP status code of the response
+        headers (dict): Headers of the response
+    """
+
+    def __init__(self, status, message, headers=None):
+        super().__init__("{} {}".format(status, message))
+        self.status = status
+        self.headers = headers or {}
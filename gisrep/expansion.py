@@ -0,0 +1,114 @@
+"""
+Expansion of issues with resources that aren't included in search results
+
+An issue's comments, events and linked pull requests each take at least one
+request per issue to fetch, so they are only fetched for templates that use
+them. The fetched resources are added to the raw issues under the name of
+the issue attribute holding them.
+
+Attributes:
+    EXPANSIONS (dict): How to fetch each expansion, keyed by the issue
+        attribute holding it
+    PER_PAGE (int): Number of resources requested per page
+"""
+from collections import namedtuple
+
+from .errors import GisrepError
+
+PER_PAGE = 100
+
+Expansion = namedtuple('Expansion', ['url', 'needed', 'select'])
+Expansion.__doc__ = """Resources fetched for each issue
+
+Attributes:
+    url (function): Function getting the API URL of an issue's resources
+    needed (function): Function checking if an issue has any resources
+    select (function): Function picking the resources from the responses
+"""
+
+
+def _has_comments(item):
+    return item.get('comments') != 0
+
+
+def _always(_):
+    return True
+
+
+def _all(resources):
+    return resources
+
+
+def _linked_pulls(events):
+    # Pull requests referencing the issue appear in its timeline
+    return [
+        event['source']['issue'] for event in events
+        if event.get('event') == 'cross-referenced' and
+        event.get('source', {}).get('issue', {}).get('pull_request')]
+
+
+EXPANSIONS = {
+    'comment_list': Expansion(
+        lambda item: item['comments_url'], _has_comments, _all),
+    'event_list': Expansion(
+        lambda item: item['events_url'], _always, _all),
+    'linked_pulls': Expansion(
+        lambda item: item['url'] + '/timeline', _always, _linked_pulls),
+}
+
+
+def fetch_expansion(client, item, name):
+    """Fetches an expansion of an issue, following every page
+
+    Args:
+        client (GithubClient): Client used to make requests
+        item (dict): Raw issue
+        name (str): Name of the expansion
+
+    Returns:
+        list: Raw resources of the expansion
+    """
+    expansion = EXPANSIONS[name]
+    if not expansion.needed(item):
+        return []
+
+    path = _api_path(client, expansion.url(item))
+    resources = []
+    page = 1
+    while True:
+        data = client.get(path, params={'per_page': PER_PAGE, 'page': page})
+        resources.extend(data)
+        if len(data) < PER_PAGE:
+            return expansion.select(resources)
+        page += 1
+
+
+def expand(client, items, names):
+    """Adds expansions to a page of issues
+
+    Args:
+        client (GithubClient): Client used to make requests
+        items (list): Raw issues, updated in place
+        names (list): Names of the expansions
+    """
+    for item in items:
+        for name in names:
+            item[name] = fetch_expansion(client, item, name)
+
+
+def _api_path(client, url):
+    """Gets the path of an API URL, relative to the client's API URL
+
+    Args:
+        client (GithubClient): Client used to make requests
+        url (str): The API URL
+
+    Returns:
+        str: The path
+
+    Raises:
+        GisrepError: The URL doesn't belong to the client's API
+    """
+    if not url.startswith(client.api_url + '/'):
+        raise GisrepError("Unexpected API URL: {}".format(url))
+    return url[len(client.api_url):]
@@ -2,37 +2,53 @@
 Application source for the gisrep issues reporter tool
 
 Attributes:
+    DEFAULT_BATCH_WORKERS (int): Default number of queries fetched
+        concurrently by the batch command
     DEFAULT_CONFIG_FILE (str): Default config file name
     DEFAULT_CONFIG_FILEPATH (str): Full file path to default config file
     DEFAULT_CONFIG_DIR (str): Default config file directory
 """
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import sys
+import time
 
 import click
-from github import Github, GithubException
-import keyring
 
-from .config import Config
-from .errors import GisrepError
-from .templates.template_manager import (
-    ExternalTemplateManager, InternalTemplateManager)
+# Modules importing PyGithub, keyring, requests or jinja2 are imported by the
+# commands that need them, as those packages are slow to import
+from .cache import DEFAULT_CACHE_DIR, RESPONSES_DIR, ResponseCache
+from .errors import ApiError, GisrepError
+from .models import Issue
+from .projection import Projection
+from .search import DEFAULT_WORKERS, ShardedSearch
 
 DEFAULT_CONFIG_DIR = os.path.expanduser("~")
 DEFAULT_CONFIG_FILE = ".gisreprc"
 DEFAULT_CONFIG_FILEPATH = os.path.join(
     DEFAULT_CONFIG_DIR, DEFAULT_CONFIG_FILE)
 DEFAULT_TEMPLATE = 'simple_report.md'
+DEFAULT_BATCH_WORKERS = 4
 
 
-def _get_credentials(config):
-    """Gets Github credentials from a config file
+def _get_credentials(config, credentials=None):
+    """Gets Github credentials from the command line or a config file
 
     Args:
-        args (list): List of command line arguments passed to gisrep
+        config (str): Path of the config file passed to gisrep, or None
+        credentials (tuple, optional): Username and password passed to gisrep
 
     Returns:
         dict: Github credentials
     """
+    if credentials:
+        # Credentials were passed on the command line
+        return {
+            'username': credentials[0],
+            'password': credentials[1],
+        }
+
     # Try to get credentials from a config file
     if config:
         # User supplied a config file path
@@ -44,6 +60,8 @@ def _get_credentials(config):
         # There are no credentials to be used
         return None
 
+    from .config import Config
+
     # Create a config object
     config = Config(config_filepath)
 
@@ -51,31 +69,219 @@ def _get_credentials(config):
     return config.get_credentials()
 
 
-def _get_template_manager(internal, external):
+def _get_client(credentials, cache, cache_dir, pool_size=None):
+    """Creates a Github API client
+
+    Args:
+        credentials (dict): Github credentials, or None
+        cache (bool): Whether to cache responses
+        cache_dir (str): Directory in which to cache responses
+        pool_size (int, optional): Number of connections to keep open
+
+    Returns:
+        GithubClient: The client
+    """
+    from .client import DEFAULT_POOL_SIZE, GithubClient
+    from .ratelimit import ANONYMOUS_LIMITS, AUTHENTICATED_LIMITS, RateLimiter
+
+    return GithubClient(
+        credentials,
+        cache=(
+            ResponseCache(os.path.join(cache_dir, RESPONSES_DIR))
+            if cache else
+            None),
+        pool_size=max(pool_size or 0, DEFAULT_POOL_SIZE),
+        limiter=RateLimiter(
+            AUTHENTICATED_LIMITS
+            if credentials is not None else
+            ANONYMOUS_LIMITS))
+
+
+def _search(client, query, workers):
+    """Starts a search for issues, checking some were found
+
+    Args:
+        client (GithubClient): Client used to make requests
+        query (str): The Github search query
+        workers (int): Number of pages to fetch concurrently
+
+    Returns:
+        ShardedSearch: The search
+
+    Raises:
+        GisrepError: No issues were found
+    """
+    search = ShardedSearch(client, query, order="asc", workers=workers)
+
+    # Check issues were found
+    if not search.total_count:
+        raise GisrepError("No matching issues found")
+
+    return search
+
+
+def _read_snapshot(path, projection):
+    """Reads the issues in a snapshot, checking it has the attributes needed
+
+    Args:
+        path (str): Path of the snapshot file
+        projection (Projection): Issue attributes required by the templates
+
+    Returns:
+        Snapshot: The snapshot, iterating over its raw issues
+
+    Raises:
+        GisrepError: The snapshot doesn't include the attributes needed
+    """
+    from .snapshot import Snapshot
+
+    snapshot = Snapshot(path)
+    missing = set(projection.fetched_fields) - snapshot.fields
+    if missing:
+        raise GisrepError(
+            "Snapshot doesn't include issue attributes: {}".format(
+                ", ".join(sorted('.'.join(field) for field in missing))))
+    return snapshot
+
+
+def _open_store(db, cache_dir):
+    """Opens the local issue database
+
+    Args:
+        db (str): Path of the database file, or None
+        cache_dir (str): Cache directory holding the default database
+
+    Returns:
+        IssueStore: The database
+    """
+    from .store import DATABASE_FILE, IssueStore
+
+    return IssueStore(
+        db if db is not None else os.path.join(cache_dir, DATABASE_FILE))
+
+
+def _read_store(store, query, projection):
+    """Finds the issues in the local database matching a query
+
+    Args:
+        store (IssueStore): The database
+        query (str): The Github search query
+        projection (Projection): Issue attributes required by the templates
+
+    Returns:
+        list: Raw issues
+
+    Raises:
+        GisrepError: The database doesn't include the attributes needed, or
+            no issues were found
+    """
+    if projection.fetched_fields:
+        raise GisrepError(
+            "Local reports don't include issue attributes: {}".format(
+                ", ".join(
+                    '.'.join(field) for field in projection.fetched_fields)))
+
+    items = store.search(query)
+    if not items:
+        raise GisrepError("No matching issues found")
+    return items
+
+
+def _get_template_manager(
+        internal, external, cache_dir=None, enable_async=False):
     """Gets template objects
 
     Args:
         template (str): Template provided by user
         is_external (bool): Indicates template is external to gisrep
+        cache_dir (str, optional): Directory in which to cache compiled
+            templates
+        enable_async (bool, optional): Whether to render templates
+            asynchronously
 
     Returns:
         Tuple(TemplateManager, str): Template manager and tag of template
     """
+    from .templates.template_manager import (
+        ExternalTemplateManager, InternalTemplateManager)
+
     if external:
         # We have been passed a template file path
         template_dir = os.path.dirname(
             os.path.abspath(external))
         template_tag = os.path.splitext(
             os.path.basename(external))[0]
-        manager = ExternalTemplateManager(template_dir)
+        manager = ExternalTemplateManager(
+            template_dir, cache_dir, enable_async)
     else:
         # We have been passed a template tag
         template_tag = internal if internal is not None else 'simple_report.md'
-        manager = InternalTemplateManager()
+        manager = InternalTemplateManager(cache_dir, enable_async)
 
     return manager, template_tag
 
 
+def _get_pygithub_factory(credentials):
+    """Gets a function that creates PyGithub issue objects
+
+    Args:
+        credentials (dict): Github credentials, or None
+
+    Returns:
+        function: Function creating a github.Issue.Issue from a search result
+    """
+    from github import Github
+    from github.Issue import Issue as PyGithubIssue
+
+    if credentials is not None:
+        api = Github(
+            credentials['username'],
+            credentials['password'])
+    else:
+        api = Github()
+
+    def create_issue(item):
+        return api.create_from_raw_data(PyGithubIssue, item)
+
+    return create_issue
+
+
+def _fetch_items(client, search, projection):
+    """Fetches search results, page by page
+
+    Args:
+        client (GithubClient): Client used to make requests
+        search (ShardedSearch): The search
+        projection (Projection): Issue attributes required by the template
+
+    Yields:
+        dict: Raw issues, as they are fetched
+    """
+    from .expansion import expand
+
+    for items in search.pages():
+        # Fetch attributes missing from the results in bulk
+        projection.complete(client, items)
+        expand(client, items, projection.expansions)
+        yield from items
+
+
+def _create_issues(client, search, projection, create_issue):
+    """Creates issue objects from search results, page by page
+
+    Args:
+        client (GithubClient): Client used to make requests
+        search (ShardedSearch): The search
+        projection (Projection): Issue attributes required by the template
+        create_issue (function): Function creating an issue from a result
+
+    Yields:
+        object: Issue objects, as they are fetched
+    """
+    for item in _fetch_items(client, search, projection):
+        yield create_issue(item)
+
+
 @click.group()
 def cli():
     """Main function for Gisrep tool
@@ -125,6 +331,8 @@ def init(username, password, force, local):
         'password': password,
     }
 
+    from .config import Config
+
     # Initialise config file
     Config(
         filepath,
@@ -138,10 +346,14 @@ def internal_template_callback(ctx, _, value):
     Args:
         ctx (TYPE): Click context
         _ (str): Parameter name
-        value (str): Tag of the internal template
+        value (tuple): Tags of the internal templates
+
+    Returns:
+        tuple: Tags of the internal templates
     """
-    if value != DEFAULT_TEMPLATE:
+    if value != (DEFAULT_TEMPLATE,):
         ctx.obj['is_internal_template'] = True
+    return value
 
 
 def external_template_callback(ctx, _, value):
@@ -150,71 +362,368 @@ def external_template_callback(ctx, _, value):
     Args:
         ctx (TYPE): Click context
         _ (str): Parameter name
-        value (click.Path): Path of the external template
+        value (tuple): Paths of the external templates
+
+    Returns:
+        tuple: Paths of the external templates
     """
     if ctx.obj['is_internal_template'] and value:
         # We only allow one of internal/external to be supplied
         click.echo("Only one of --internal/--external may be supplied")
         ctx.exit()
+    return value
+
+
+def client_options(command):
+    """Adds the options used to connect to Github to a command
+
+    Args:
+        command (function): The command function
+
+    Returns:
+        function: The decorated command function
+    """
+    options = [
+        click.option(
+            '--config',
+            type=click.File('rb'),
+            help="Path to gisrep config file"),
+        click.option(
+            '--credentials', nargs=2, type=str, help="Username and password"),
+        click.option(
+            '--cache/--no-cache',
+            default=True,
+            help="Revalidate previously fetched results and reuse compiled "
+                 "templates"),
+        click.option(
+            '--cache-dir',
+            type=click.Path(file_okay=False),
+            default=DEFAULT_CACHE_DIR,
+            help="Directory in which to cache Github responses and compiled "
+                 "templates"),
+        click.option(
+            '--fetch-workers',
+            type=click.IntRange(min=1),
+            default=DEFAULT_WORKERS,
+            help="Number of result pages to fetch concurrently"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
 
 
 @cli.command()
-@click.argument('query')
+@click.argument('query', required=False)
 @click.option(
     '--external',
     type=click.Path('rb'),
-    help="Custom template for formatting the results",
+    multiple=True,
+    help="Custom template for formatting the results (may be repeated)",
     callback=external_template_callback)
 @click.option(
     '--internal',
     type=str,
-    default=DEFAULT_TEMPLATE,
-    help="Internal Gisrep template for formatting the results",
+    multiple=True,
+    default=(DEFAULT_TEMPLATE,),
+    help="Internal Gisrep template for formatting the results (may be "
+         "repeated)",
     callback=internal_template_callback,
     is_eager=True)
+@client_options
+@click.option(
+    '--pygithub',
+    is_flag=True,
+    help="Pass PyGithub issue objects to the template instead of compact "
+         "issue records")
+@click.option(
+    '--output', '-o',
+    type=click.File('w'),
+    multiple=True,
+    help="File to write the report to (defaults to stdout). Repeat once for "
+         "each template")
+@click.option(
+    '--stream',
+    is_flag=True,
+    help="Write the report as it is rendered, while issues are still being "
+         "fetched")
+@click.option(
+    '--from-snapshot',
+    type=click.Path(exists=True, dir_okay=False),
+    help="Publish the issues in a snapshot file written by 'fetch' instead "
+         "of searching Github")
 @click.option(
-    '--config',
-    type=click.File('rb'),
-    help="Path to gisrep config file")
-@click.option('--credentials', nargs=2, type=str, help="Username and password")
-def report(query, external, internal, config, credentials):
+    '--async', 'use_async',
+    is_flag=True,
+    help="Render the report while its issues (and their comments, events or "
+         "linked pull requests) are fetched concurrently")
+@click.option(
+    '--local',
+    is_flag=True,
+    help="Search the issue database written by 'sync' instead of Github")
+@click.option(
+    '--db',
+    type=click.Path(dir_okay=False),
+    help="Issue database to search with --local (defaults to one in the "
+         "cache directory)")
+def report(  # pylint: disable=too-many-arguments,too-many-locals
+        query, external, internal, config, credentials, cache, cache_dir,
+        fetch_workers, pygithub, output, stream, from_snapshot, use_async,
+        local, db):
     """Publishes a report of nicely formatted Github issues specified by a
     Github issues search query (see
     help.github.com/articles/searching-issues-and-pull-requests/)
 
+    The issues are fetched once and then formatted with every template
+    given, writing each report to the --output in the same position.
+
     \b
-    QUERY: The Github query to find issues for
+    QUERY: The Github query to find issues for (unless --from-snapshot is
+           given). With --local, only the repo:, label:, milestone:, state:,
+           is:, author:, assignee: and no: qualifiers are supported
     """
 
-    # Attempt to get Github credentials
-    if not credentials:
-        credentials = _get_credentials(config)
-
-    # Create PyGithub API object
-    if credentials is not None:
-        api = Github(
-            credentials['username'],
-            credentials['password'])
+    # Pair each template with its output
+    template_args = (
+        [(None, path) for path in external]
+        if external else
+        [(tag, None) for tag in internal])
+    if not output:
+        output = (click.open_file('-', 'w'),)
+    if len(output) != len(template_args):
+        raise GisrepError("Each template must have its own --output")
+    if (stream or use_async) and len(template_args) > 1:
+        raise GisrepError("Only a single template may be streamed")
+    if use_async and (from_snapshot or local):
+        raise GisrepError("--async only applies to searches of Github")
+
+    # Create the template mangers
+    builders = [
+        _get_template_manager(
+            template_internal, template_external,
+            cache_dir if cache else None, use_async)
+        for template_internal, template_external in template_args]
+
+    # Determine the issue attributes the templates need
+    fields = set()
+    for builder, template_tag in builders:
+        fields.update(builder.get_fields(template_tag))
+    projection = Projection(fields)
+
+    if from_snapshot:
+        # Read the issues from the snapshot, without connecting to Github
+        credentials = None
+        items = _read_snapshot(from_snapshot, projection)
+    elif local and query is not None:
+        # Search the local database, without connecting to Github
+        credentials = None
+        store = _open_store(db, cache_dir)
+        try:
+            items = _read_store(store, query, projection)
+        finally:
+            store.close()
+    elif query is not None:
+        # Attempt to get Github credentials
+        credentials = _get_credentials(config, credentials)
+
+        # Create the API client
+        client = _get_client(credentials, cache, cache_dir)
+
+        # Request the issues
+        search = _search(client, query, fetch_workers)
+        items = _fetch_items(client, search, projection)
     else:
-        api = Github()
+        raise GisrepError("Either a QUERY or --from-snapshot is required")
+
+    # Create issue objects from the search results
+    create_issue = (
+        _get_pygithub_factory(credentials)
+        if pygithub else
+        Issue.from_raw)
+    if use_async:
+        from . import aio
+
+        # Render the report while fetching issues concurrently
+        builder, template_tag = builders[0]
+        aio.publish(
+            builder, template_tag, client, search, projection, create_issue,
+            output[0], fetch_workers)
+        return
+
+    issues = (create_issue(item) for item in items)
+
+    if stream:
+        # Write the report as issues are fetched
+        builder, template_tag = builders[0]
+        for chunk in builder.stream(template_tag, issues):
+            output[0].write(chunk)
+        return
+
+    # Fetch every issue before rendering the reports from them
+    issues = list(issues)
+
+    def publish(builder_output):
+        (builder, template_tag), report_output = builder_output
+
+        # Generate report
+        report_obj = builder.generate(
+            template_tag,
+            issues)
+
+        # Output report
+        click.echo(report_obj, file=report_output)
+
+    if len(builders) == 1:
+        publish((builders[0], output[0]))
+        return
+
+    with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+        list(executor.map(publish, zip(builders, output)))
+
+
+@cli.command()
+@click.argument('query')
+@click.option(
+    '--output', '-o',
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Snapshot file to write")
+@click.option(
+    '--field', 'fields',
+    multiple=True,
+    help="Issue attribute to fetch in addition to the search results, e.g. "
+         "user.name (may be repeated)")
+@client_options
+def fetch(  # pylint: disable=too-many-arguments
+        query, output, fields, config, credentials, cache, cache_dir,
+        fetch_workers):
+    """Saves the Github issues specified by a search query to a snapshot
+    file, for publishing later with 'report --from-snapshot'.
+
+    \b
+    QUERY: The Github query to find issues for
+    """
+    from .snapshot import write_snapshot
+
+    projection = Projection(
+        tuple(field.split('.')[:2]) for field in fields)
 
     # Request the issues
-    issues = api.search_issues(query, sort="created", order="asc")
+    credentials = _get_credentials(config, credentials)
+    client = _get_client(credentials, cache, cache_dir)
+    search = _search(client, query, fetch_workers)
 
-    # Check issues were found
-    if not issues.get_page(0):
-        raise GisrepError("No matching issues found")
+    # Write them to the snapshot as they are fetched
+    count = write_snapshot(
+        output, query, _fetch_items(client, search, projection),
+        projection.fetched_fields)
+    click.echo("Saved {} issues to {}".format(count, output), err=True)
+
+
+@cli.command()
+@click.argument('query')
+@click.option(
+    '--db',
+    type=click.Path(dir_okay=False),
+    help="Issue database to write to (defaults to one in the cache "
+         "directory)")
+@client_options
+def sync(  # pylint: disable=too-many-arguments
+        query, db, config, credentials, cache, cache_dir, fetch_workers):
+    """Mirrors the Github issues specified by a search query into a local
+    database, for publishing with 'report --local'. Syncing the same query
+    again only fetches the issues updated since.
+
+    \b
+    QUERY: The Github query to find issues for
+    """
+    store = _open_store(db, cache_dir)
+    try:
+        credentials = _get_credentials(config, credentials)
+        client = _get_client(credentials, cache, cache_dir)
+        count = store.sync(client, query, fetch_workers)
+        click.echo(
+            "Synced {} issues to {}".format(count, store.path), err=True)
+    finally:
+        store.close()
 
-    # Create the template manger
-    builder, template_tag = _get_template_manager(internal, external)
 
-    # Generate report
-    report_obj = builder.generate(
-        template_tag,
-        issues)
+@cli.command()
+@click.argument('manifest', type=click.Path(exists=True, dir_okay=False))
+@client_options
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_WORKERS,
+    help="Number of queries to fetch concurrently")
+def batch(  # pylint: disable=too-many-arguments,too-many-locals
+        manifest, config, credentials, cache, cache_dir, fetch_workers,
+        jobs):
+    """Publishes every report listed in a manifest file, sharing one Github
+    connection. Reports with the same query are only fetched once.
 
-    # Output report
-    click.echo(report_obj)
+    \b
+    MANIFEST: TOML file with a [[report]] table for each report, giving its
+              'query', 'output' and either 'internal' or 'external' template
+    """
+    from .batch import read_manifest
+
+    reports = read_manifest(manifest)
+
+    # Connect to Github once for every report
+    credentials = _get_credentials(config, credentials)
+    client = _get_client(
+        credentials, cache, cache_dir,
+        pool_size=jobs * fetch_workers)
+
+    # Group the reports by query, fetching the attributes all of them need
+    managers = {}
+    queries = OrderedDict()
+    for job in reports:
+        key = (job.internal, job.external)
+        if key not in managers:
+            managers[key] = _get_template_manager(
+                job.internal, job.external, cache_dir if cache else None)
+        builder, template_tag = managers[key]
+        queries.setdefault(job.query, []).append(
+            (job, builder, template_tag))
+
+    def fetch(query):
+        start = time.time()
+        fields = set()
+        for _, builder, template_tag in queries[query]:
+            fields.update(builder.get_fields(template_tag))
+        search = _search(client, query, fetch_workers)
+        issues = list(_create_issues(
+            client, search, Projection(fields), Issue.from_raw))
+        return issues, time.time() - start
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(fetch, query): query
+            for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                issues, fetch_time = future.result()
+            except GisrepError as exc:
+                failures += len(queries[query])
+                click.echo("{}: {}".format(query, exc), err=True)
+                continue
+
+            # Render each report using this query
+            for job, builder, template_tag in queries[query]:
+                start = time.time()
+                with open(job.output, 'w') as output:
+                    output.write(builder.generate(template_tag, issues))
+                click.echo(
+                    "{} ({} issues, fetch {:.2f}s, render {:.2f}s)".format(
+                        job.output, len(issues), fetch_time,
+                        time.time() - start))
+
+    if failures:
+        raise GisrepError("{} of {} reports failed".format(
+            failures, len(reports)))
 
 
 @cli.command()
@@ -222,6 +731,8 @@ def templates():
     """Lists internal templates shipped with gisrep that may be used with the
     'report' command to format the results.
     """
+    from .templates.template_manager import InternalTemplateManager
+
     builder = InternalTemplateManager()
     for template in builder.list():
         click.echo(template)
@@ -235,12 +746,36 @@ def main():
     try:
         cli(  # pylint: disable=unexpected-keyword-arg
             obj={'is_internal_template': False})
+    except ApiError as exc:
+        click.echo("Github API Error: {}".format(exc))
     except GisrepError as exc:
         click.echo("Gisrep Error: {}".format(exc))
-    except GithubException as exc:
-        click.echo("Github API Error: {}".format(exc))
-    except keyring.errors.KeyringError as exc:
-        click.echo("Keyring Error: {}".format(exc))
+    except Exception as exc:  # pylint: disable=broad-except
+        # Only check errors of dependencies the command has imported
+        if _is_error(exc, 'github', 'GithubException'):
+            click.echo("Github API Error: {}".format(exc))
+        elif _is_error(exc, 'keyring.errors', 'KeyringError'):
+            click.echo("Keyring Error: {}".format(exc))
+        else:
+            raise
+
+
+def _is_error(exc, module_name, class_name):
+    """Checks if an exception is an error type of an imported module
+
+    Args:
+        exc (Exception): The exception
+        module_name (str): Name of the module defining the error type
+        class_name (str): Name of the error type
+
+    Returns:
+        bool: True if the module is imported and the exception is an instance
+            of the error type
+    """
+    module = sys.modules.get(module_name)
+    return (
+        module is not None and
+        isinstance(exc, getattr(module, class_name)))
 
 
 if __name__ == '__main__':
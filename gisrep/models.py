@@ -0,0 +1,225 @@
+"""
+Compact, immutable records of the issues passed to templates
+
+Records are built once from the search results and hold only the values
+gisrep can provide, rather than the raw results and the machinery PyGithub
+objects carry to fetch missing attributes.
+"""
+from collections import namedtuple
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _parse_time(value):
+    """Parses a timestamp from the Github API
+
+    Args:
+        value (str): The timestamp, or None
+
+    Returns:
+        datetime: The parsed timestamp, or None
+    """
+    if value is None:
+        return None
+    return datetime.strptime(value, TIME_FORMAT)
+
+
+class User(namedtuple('User', [
+        'login', 'id', 'node_id', 'avatar_url', 'gravatar_id', 'url',
+        'html_url', 'type', 'site_admin', 'name', 'company', 'location'])):
+
+    """Github user
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates a user from the Github API representation
+
+        Args:
+            raw (dict): The raw user, or None
+
+        Returns:
+            User: The user, or None
+        """
+        if raw is None:
+            return None
+        return cls(**{field: raw.get(field) for field in cls._fields})
+
+
+class Label(namedtuple('Label', [
+        'id', 'node_id', 'url', 'name', 'color', 'default',
+        'description'])):
+
+    """Github issue label
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates a label from the Github API representation
+
+        Args:
+            raw (dict): The raw label
+
+        Returns:
+            Label: The label
+        """
+        return cls(**{field: raw.get(field) for field in cls._fields})
+
+
+class Milestone(namedtuple('Milestone', [
+        'url', 'html_url', 'labels_url', 'id', 'node_id', 'number', 'title',
+        'description', 'creator', 'open_issues', 'closed_issues', 'state',
+        'created_at', 'updated_at', 'due_on', 'closed_at'])):
+
+    """Github milestone
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates a milestone from the Github API representation
+
+        Args:
+            raw (dict): The raw milestone, or None
+
+        Returns:
+            Milestone: The milestone, or None
+        """
+        if raw is None:
+            return None
+        values = {field: raw.get(field) for field in cls._fields}
+        values['creator'] = User.from_raw(raw.get('creator'))
+        for field in ('created_at', 'updated_at', 'due_on', 'closed_at'):
+            values[field] = _parse_time(values[field])
+        return cls(**values)
+
+
+class PullRequest(namedtuple('PullRequest', [
+        'url', 'html_url', 'diff_url', 'patch_url'])):
+
+    """Links to the pull request an issue represents
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates pull request links from the Github API representation
+
+        Args:
+            raw (dict): The raw pull request links, or None
+
+        Returns:
+            PullRequest: The pull request links, or None
+        """
+        if raw is None:
+            return None
+        return cls(**{field: raw.get(field) for field in cls._fields})
+
+
+class Comment(namedtuple('Comment', [
+        'id', 'node_id', 'url', 'html_url', 'body', 'user', 'created_at',
+        'updated_at', 'author_association'])):
+
+    """Comment on a Github issue
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates a comment from the Github API representation
+
+        Args:
+            raw (dict): The raw comment
+
+        Returns:
+            Comment: The comment
+        """
+        values = {field: raw.get(field) for field in cls._fields}
+        values['user'] = User.from_raw(values['user'])
+        for field in ('created_at', 'updated_at'):
+            values[field] = _parse_time(values[field])
+        return cls(**values)
+
+
+class Event(namedtuple('Event', [
+        'id', 'node_id', 'url', 'actor', 'event', 'commit_id', 'commit_url',
+        'created_at', 'label', 'assignee', 'milestone'])):
+
+    """Event in the history of a Github issue
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates an event from the Github API representation
+
+        Args:
+            raw (dict): The raw event
+
+        Returns:
+            Event: The event
+        """
+        values = {field: raw.get(field) for field in cls._fields}
+        for field in ('actor', 'assignee'):
+            values[field] = User.from_raw(values[field])
+        values['created_at'] = _parse_time(values['created_at'])
+        if values['label'] is not None:
+            values['label'] = Label.from_raw(values['label'])
+        values['milestone'] = Milestone.from_raw(values['milestone'])
+        return cls(**values)
+
+
+class Issue(namedtuple('Issue', [
+        'id', 'node_id', 'number', 'title', 'state', 'locked', 'body', 'url',
+        'html_url', 'repository_url', 'labels_url', 'comments_url',
+        'events_url', 'comments', 'created_at', 'updated_at', 'closed_at',
+        'author_association', 'score', 'user', 'assignee', 'assignees',
+        'labels', 'milestone', 'pull_request', 'closed_by', 'body_html',
+        'comment_list', 'event_list', 'linked_pulls'])):
+
+    """Github issue (or pull request) found by a search
+
+    The comment_list, event_list and linked_pulls of an issue are only
+    fetched if a template uses them, and are otherwise None.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Creates an issue from a search result
+
+        Args:
+            raw (dict): The raw issue
+
+        Returns:
+            Issue: The issue
+        """
+        values = {field: raw.get(field) for field in cls._fields}
+        for field in ('created_at', 'updated_at', 'closed_at'):
+            values[field] = _parse_time(values[field])
+        for field in ('user', 'assignee', 'closed_by'):
+            values[field] = User.from_raw(values[field])
+        values['assignees'] = tuple(
+            User.from_raw(user) for user in raw.get('assignees') or [])
+        values['labels'] = tuple(
+            Label.from_raw(label) for label in raw.get('labels') or [])
+        values['milestone'] = Milestone.from_raw(values['milestone'])
+        values['pull_request'] = PullRequest.from_raw(values['pull_request'])
+        for field, record in (
+                ('comment_list', Comment),
+                ('event_list', Event),
+                ('linked_pulls', Issue)):
+            if values[field] is not None:
+                values[field] = tuple(
+                    record.from_raw(value) for value in values[field])
+        return cls(**values)
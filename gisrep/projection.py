@@ -0,0 +1,217 @@
+"""
+Projection of the issue attributes used by a template onto Github requests
+
+Most issue attributes are included in search results. The few that are not
+would otherwise be fetched by a separate request per issue, so they are
+instead fetched in bulk with one GraphQL query per page of results. An
+issue's comments, events and linked pull requests are expansions, fetched
+with requests for each issue, and only if a template uses them.
+
+Attributes:
+    EXPANDED_FIELDS (dict): Attributes of the objects in each expansion,
+        keyed by the issue attribute holding them
+    GRAPHQL_FIELDS (dict): Attributes that are fetched with GraphQL, mapped
+        to how they are fetched
+    NESTED_SEARCH_FIELDS (dict): Attributes of objects nested in search
+        results, keyed by the issue attribute holding the object
+    SEARCH_FIELDS (set): Issue attributes included in search results
+"""
+from collections import namedtuple
+
+from .errors import GisrepError
+
+USER_FIELDS = {
+    'login', 'id', 'node_id', 'avatar_url', 'gravatar_id', 'url', 'html_url',
+    'type', 'site_admin',
+}
+LABEL_FIELDS = {
+    'id', 'node_id', 'url', 'name', 'color', 'default', 'description',
+}
+MILESTONE_FIELDS = {
+    'url', 'html_url', 'labels_url', 'id', 'node_id', 'number', 'title',
+    'description', 'creator', 'open_issues', 'closed_issues', 'state',
+    'created_at', 'updated_at', 'due_on', 'closed_at',
+}
+PULL_REQUEST_FIELDS = {'url', 'html_url', 'diff_url', 'patch_url'}
+
+NESTED_SEARCH_FIELDS = {
+    'user': USER_FIELDS,
+    'assignee': USER_FIELDS,
+    'assignees': USER_FIELDS,
+    'labels': LABEL_FIELDS,
+    'milestone': MILESTONE_FIELDS,
+    'pull_request': PULL_REQUEST_FIELDS,
+}
+SEARCH_FIELDS = {
+    'id', 'node_id', 'number', 'title', 'state', 'locked', 'body', 'url',
+    'html_url', 'repository_url', 'labels_url', 'comments_url', 'events_url',
+    'comments', 'created_at', 'updated_at', 'closed_at',
+    'author_association', 'score',
+} | set(NESTED_SEARCH_FIELDS)
+
+COMMENT_FIELDS = {
+    'id', 'node_id', 'url', 'html_url', 'body', 'user', 'created_at',
+    'updated_at', 'author_association',
+}
+EVENT_FIELDS = {
+    'id', 'node_id', 'url', 'actor', 'event', 'commit_id', 'commit_url',
+    'created_at', 'label', 'assignee', 'milestone',
+}
+EXPANDED_FIELDS = {
+    'comment_list': COMMENT_FIELDS,
+    'event_list': EVENT_FIELDS,
+    'linked_pulls': SEARCH_FIELDS,
+}
+
+GraphqlField = namedtuple('GraphqlField', ['selection', 'merge'])
+GraphqlField.__doc__ = """Attribute fetched with GraphQL
+
+Attributes:
+    selection (str): GraphQL selection fetching the attribute
+    merge (function): Function merging the GraphQL node into a raw issue
+"""
+
+
+def _merge_author(field):
+    def merge(issue, node):
+        if issue.get('user') is not None:
+            issue['user'][field] = (node.get('author') or {}).get(field)
+    return merge
+
+
+def _merge_closed_by(issue, node):
+    events = node.get('timelineItems', {}).get('nodes')
+    actor = events[-1]['actor'] if events else None
+    issue['closed_by'] = (
+        {'login': actor['login']}
+        if actor is not None else
+        None)
+
+
+def _merge_body_html(issue, node):
+    issue['body_html'] = node.get('bodyHTML')
+
+
+GRAPHQL_FIELDS = {
+    ('user', 'name'): GraphqlField(
+        "author { ... on User { name } }", _merge_author('name')),
+    ('user', 'company'): GraphqlField(
+        "author { ... on User { company } }", _merge_author('company')),
+    ('user', 'location'): GraphqlField(
+        "author { ... on User { location } }", _merge_author('location')),
+    ('closed_by',): GraphqlField(
+        "timelineItems(itemTypes: CLOSED_EVENT, last: 1) "
+        "{ nodes { ... on ClosedEvent { actor { login } } } }",
+        _merge_closed_by),
+    ('closed_by', 'login'): GraphqlField(
+        "timelineItems(itemTypes: CLOSED_EVENT, last: 1) "
+        "{ nodes { ... on ClosedEvent { actor { login } } } }",
+        _merge_closed_by),
+    ('body_html',): GraphqlField("bodyHTML", _merge_body_html),
+}
+
+GRAPHQL_QUERY = """
+query($ids: [ID!]!) {{
+  nodes(ids: $ids) {{
+    ... on Issue {{ id {0} }}
+    ... on PullRequest {{ id {0} }}
+  }}
+}}
+"""
+
+
+class Projection(object):
+
+    """The issue attributes a template uses, and how to fetch them
+
+    Attributes:
+        fields (set): Attribute paths used by the template, as tuples
+        graphql_fields (list): Attribute paths fetched with GraphQL
+        expansions (list): Names of the expansions fetched for each issue
+    """
+
+    def __init__(self, fields):
+        """Creates a projection, checking every attribute can be provided
+
+        Args:
+            fields (set): Attribute paths used by the template, as tuples
+
+        Raises:
+            GisrepError: A template uses attributes gisrep cannot provide
+        """
+        self.fields = set(fields)
+        self.graphql_fields = sorted(
+            path for path in self.fields if path in GRAPHQL_FIELDS)
+        self.expansions = sorted(set(
+            path[0] for path in self.fields if path[0] in EXPANDED_FIELDS))
+
+        unsupported = sorted(
+            path for path in self.fields
+            if path not in GRAPHQL_FIELDS and
+            not _in_search_results(path) and
+            not _in_expansions(path))
+        if unsupported:
+            raise GisrepError(
+                "Template uses unsupported issue attributes: {}".format(
+                    ", ".join('.'.join(path) for path in unsupported)))
+
+    @property
+    def fetched_fields(self):
+        """Gets the attributes fetched in addition to the search results
+
+        Returns:
+            list: Attribute paths, as tuples
+        """
+        return self.graphql_fields + [(name,) for name in self.expansions]
+
+    def complete(self, client, issues):
+        """Adds the attributes missing from search results to a page of issues
+
+        Args:
+            client (GithubClient): Client used to make requests
+            issues (list): Raw issue dictionaries, updated in place
+        """
+        if not self.graphql_fields or not issues:
+            return
+
+        fields = [GRAPHQL_FIELDS[path] for path in self.graphql_fields]
+        selections = sorted(set(field.selection for field in fields))
+        data = client.graphql(
+            GRAPHQL_QUERY.format(' '.join(selections)),
+            {'ids': [issue['node_id'] for issue in issues]})
+
+        # Nodes are returned in the order their IDs were requested
+        for issue, node in zip(issues, data['nodes']):
+            for merge in set(field.merge for field in fields):
+                merge(issue, node or {})
+
+
+def _in_search_results(path):
+    """Determines if an attribute is included in search results
+
+    Args:
+        path (tuple): Attribute path, e.g. ('user', 'login')
+
+    Returns:
+        bool: True if the attribute is included
+    """
+    if path[0] not in SEARCH_FIELDS:
+        return False
+    if len(path) == 1 or path[0] not in NESTED_SEARCH_FIELDS:
+        # Attributes of plain values (e.g. strings) are always available
+        return True
+    return path[1] in NESTED_SEARCH_FIELDS[path[0]]
+
+
+def _in_expansions(path):
+    """Determines if an attribute is provided by an expansion
+
+    Args:
+        path (tuple): Attribute path, e.g. ('comment_list', 'body')
+
+    Returns:
+        bool: True if the attribute is provided
+    """
+    if path[0] not in EXPANDED_FIELDS:
+        return False
+    return len(path) == 1 or path[1] in EXPANDED_FIELDS[path[0]]
@@ -0,0 +1,217 @@
+"""
+Scheduling of requests within the Github API's rate limits
+
+Each API resource (the search API, the rest of the REST API and the GraphQL
+API) has its own token bucket, shared by every thread making requests with a
+client. The buckets are kept in step with the rate limit headers of the
+responses, and throttled requests pause their resource until the limit
+resets, before being retried with a jittered backoff.
+
+Attributes:
+    ANONYMOUS_LIMITS (dict): Requests allowed per period for each resource,
+        without credentials
+    AUTHENTICATED_LIMITS (dict): Requests allowed per period for each
+        resource, with credentials
+    BASE_BACKOFF (float): Delay before the first retry without a reset time,
+        in seconds
+    DEFAULT_RETRIES (int): Default number of times a throttled request is
+        retried
+    MAX_BACKOFF (float): Longest delay between retries without a reset time,
+        in seconds
+"""
+import random
+import threading
+import time
+
+ANONYMOUS_LIMITS = {
+    'core': (60, 3600),
+    'search': (10, 60),
+}
+AUTHENTICATED_LIMITS = {
+    'core': (5000, 3600),
+    'search': (30, 60),
+    'graphql': (5000, 3600),
+}
+BASE_BACKOFF = 1.0
+DEFAULT_RETRIES = 5
+MAX_BACKOFF = 60.0
+
+
+class RateLimiter(object):
+
+    """Token buckets limiting the rate of requests to each API resource
+
+    Attributes:
+        retries (int): Number of times a throttled request is retried
+    """
+
+    def __init__(
+            self, limits=None, retries=DEFAULT_RETRIES, clock=time.time,
+            sleep=time.sleep):
+        """Creates the token buckets, which start full
+
+        Args:
+            limits (dict, optional): Tuples of the requests allowed and the
+                period in seconds, for each resource
+            retries (int, optional): Number of times a throttled request is
+                retried
+            clock (function, optional): Function returning the current time
+            sleep (function, optional): Function waiting for some seconds
+        """
+        self.retries = retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._paused_until = {}
+
+        now = clock()
+        for resource, (requests, period) in (
+                limits or AUTHENTICATED_LIMITS).items():
+            self._buckets[resource] = _Bucket(
+                max(requests, 1), max(requests, 1) / float(period), now)
+
+    def acquire(self, resource):
+        """Waits until a request to a resource may be made
+
+        Args:
+            resource (str): The API resource, e.g. 'search'
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                delay = self._paused_until.get(resource, 0) - now
+                bucket = self._buckets.get(resource)
+                if delay <= 0:
+                    if bucket is None:
+                        return
+                    delay = bucket.take(now)
+                    if delay <= 0:
+                        return
+            self._sleep(delay)
+
+    def update(self, resource, headers):
+        """Keeps a resource's bucket in step with a response's headers
+
+        Args:
+            resource (str): The API resource, e.g. 'search'
+            headers (dict): Headers of the response
+        """
+        remaining = _header(headers, 'X-RateLimit-Remaining')
+        reset = _header(headers, 'X-RateLimit-Reset')
+        if remaining is None:
+            return
+
+        with self._lock:
+            bucket = self._buckets.get(resource)
+            if bucket is not None:
+                bucket.tokens = min(bucket.tokens, remaining)
+            if remaining <= 0 and reset is not None:
+                self._pause(resource, reset - self._clock())
+
+    def backoff(self, resource, attempt, headers):
+        """Pauses requests to a resource after a request was throttled
+
+        The pause lasts until the rate limit resets, if the response says
+        when, and otherwise grows exponentially with each attempt. A random
+        jitter is added so that paused threads don't retry all at once.
+
+        Args:
+            resource (str): The API resource, e.g. 'search'
+            attempt (int): Number of times the request has been retried
+            headers (dict): Headers of the throttled response
+        """
+        retry_after = _header(headers, 'Retry-After')
+        reset = _header(headers, 'X-RateLimit-Reset')
+        remaining = _header(headers, 'X-RateLimit-Remaining')
+        with self._lock:
+            now = self._clock()
+            if retry_after is not None:
+                delay = retry_after
+            elif remaining == 0 and reset is not None:
+                delay = reset - now
+            else:
+                delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt)
+            self._pause(resource, delay + random.uniform(0, BASE_BACKOFF))
+        self.acquire(resource)
+
+    def _pause(self, resource, delay):
+        """Pauses requests to a resource, within the lock
+
+        Args:
+            resource (str): The API resource, e.g. 'search'
+            delay (float): Seconds to pause for
+        """
+        self._paused_until[resource] = max(
+            self._paused_until.get(resource, 0),
+            self._clock() + max(delay, 0))
+
+
+class _Bucket(object):
+
+    """Token bucket refilled at a constant rate
+
+    Attributes:
+        capacity (float): Maximum number of tokens
+        rate (float): Tokens added per second
+        tokens (float): Number of tokens
+    """
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self._updated = now
+
+    def take(self, now):
+        """Takes a token, if one is available
+
+        Args:
+            now (float): The current time
+
+        Returns:
+            float: Seconds to wait for a token, or 0 if one was taken
+        """
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+def is_throttled(status, headers, message=""):
+    """Checks if a response shows a request was rate limited
+
+    Args:
+        status (int): HTTP status code of the response
+        headers (dict): Headers of the response
+        message (str, optional): Error message of the response
+
+    Returns:
+        bool: True if the request should be retried later
+    """
+    if status == 429:
+        return True
+    return status == 403 and (
+        _header(headers, 'X-RateLimit-Remaining') == 0 or
+        _header(headers, 'Retry-After') is not None or
+        "rate limit" in message.lower())
+
+
+def _header(headers, name):
+    """Gets a numeric header
+
+    Args:
+        headers (dict): Response headers
+        name (str): Name of the header
+
+    Returns:
+        int: Value of the header, or None if it is missing or invalid
+    """
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,260 @@
+"""
+Github issue searches
+
+Attributes:
+    DEFAULT_WORKERS (int): Default number of pages fetched concurrently
+    MAX_RESULTS (int): Maximum number of results the search API will return
+    PER_PAGE (int): Number of results requested per page
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import math
+
+DEFAULT_WORKERS = 4
+MAX_RESULTS = 1000
+PER_PAGE = 100
+SEARCH_PATH = "/search/issues"
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class IssueSearch(object):
+
+    """Search for Github issues, fetched page by page
+
+    The first page is fetched once and shared between checking the number of
+    results and iterating over them. The remaining pages are then fetched
+    concurrently, but are still yielded in order.
+
+    Attributes:
+        client (GithubClient): Client used to make requests
+        query (str): The Github search query
+        sort (str): Field to sort the results by
+        order (str): Sort order of the results
+        workers (int): Maximum number of pages fetched concurrently
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, client, query, sort="created", order="asc",
+            workers=DEFAULT_WORKERS):
+        self.client = client
+        self.query = query
+        self.sort = sort
+        self.order = order
+        self.workers = workers
+        self._first_page = None
+
+    @property
+    def total_count(self):
+        """Gets the number of issues matching the query
+
+        Returns:
+            int: Number of matching issues
+        """
+        return self.first_page()['total_count']
+
+    @property
+    def page_count(self):
+        """Gets the number of pages the search API will return
+
+        Returns:
+            int: Number of pages
+        """
+        return int(math.ceil(min(self.total_count, MAX_RESULTS) / PER_PAGE))
+
+    def first_page(self):
+        """Gets the first page of results, fetching it if required
+
+        Returns:
+            dict: Search API response for the first page
+        """
+        if self._first_page is None:
+            self._first_page = self.get_page(1)
+        return self._first_page
+
+    def get_page(self, page):
+        """Fetches a page of results
+
+        Args:
+            page (int): Page number, starting from 1
+
+        Returns:
+            dict: Search API response for the page
+        """
+        return self.client.get(SEARCH_PATH, params={
+            'q': self.query,
+            'sort': self.sort,
+            'order': self.order,
+            'per_page': PER_PAGE,
+            'page': page,
+        })
+
+    def pages(self):
+        """Iterates over the pages of results
+
+        Yields:
+            list: Raw issue dictionaries of each page
+        """
+        yield self.first_page()['items']
+
+        remaining = range(2, self.page_count + 1)
+        if self.workers <= 1 or len(remaining) <= 1:
+            for page in remaining:
+                yield self.get_page(page)['items']
+            return
+
+        with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(remaining))) as executor:
+            # Results of map() are returned in the order pages were submitted
+            for response in executor.map(self.get_page, remaining):
+                yield response['items']
+
+    def __iter__(self):
+        for items in self.pages():
+            yield from items
+
+
+class ShardedSearch(object):
+
+    """Search for Github issues that is not limited to the first 1000 results
+
+    Queries with more results than the search API will return are split into
+    shards covering disjoint 'created:' date ranges, bisecting until each
+    shard is within the limit. The shards are fetched concurrently and their
+    results are yielded in order of creation.
+
+    Attributes:
+        client (GithubClient): Client used to make requests
+        query (str): The Github search query
+        order (str): Order of creation to yield the results in
+        workers (int): Maximum number of pages or shards fetched concurrently
+    """
+
+    def __init__(
+            self, client, query, order="asc", workers=DEFAULT_WORKERS):
+        self.client = client
+        self.query = query
+        self.order = order
+        self.workers = workers
+        self._search = IssueSearch(
+            client, query, sort="created", order=order, workers=workers)
+        self._shards = None
+
+    @property
+    def total_count(self):
+        """Gets the number of issues matching the query
+
+        Returns:
+            int: Number of matching issues
+        """
+        return self._search.total_count
+
+    def shards(self):
+        """Gets the searches the query is split into, splitting it if required
+
+        Returns:
+            list: IssueSearch objects, in order of creation
+        """
+        if self._shards is None:
+            if self.total_count <= MAX_RESULTS:
+                self._shards = [self._search]
+            else:
+                self._shards = self._split()
+        return self._shards
+
+    def pages(self):
+        """Iterates over the pages of results from every shard
+
+        Yields:
+            list: Raw issue dictionaries of each page
+        """
+        shards = self.shards()
+        if len(shards) == 1:
+            yield from shards[0].pages()
+            return
+
+        with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(shards))) as executor:
+            for pages in executor.map(_fetch_pages, shards):
+                yield from pages
+
+    def __iter__(self):
+        for items in self.pages():
+            yield from items
+
+    def _split(self):
+        """Bisects the query by date of creation until every shard is within
+        the search API's limit
+
+        Returns:
+            list: IssueSearch objects, in order of creation
+        """
+        shards = []
+        pending = [self._bounds()]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending:
+                searches = [self._shard(start, end) for start, end in pending]
+                counts = executor.map(_total_count, searches)
+
+                ranges = pending
+                pending = []
+                for (start, end), search, count in zip(
+                        ranges, searches, counts):
+                    seconds = int((end - start).total_seconds())
+                    if count > MAX_RESULTS and seconds > 0:
+                        # Split the range into two disjoint halves
+                        middle = start + timedelta(seconds=seconds // 2)
+                        pending.append((start, middle))
+                        pending.append((middle + timedelta(seconds=1), end))
+                    elif count:
+                        shards.append((start, search))
+
+        shards.sort(key=lambda shard: shard[0], reverse=self.order == "desc")
+        return [search for _, search in shards]
+
+    def _bounds(self):
+        """Gets the creation times of the oldest and newest matching issues
+
+        Returns:
+            tuple: Pair of datetimes
+        """
+        opposite = "desc" if self.order == "asc" else "asc"
+        last = self.client.get(SEARCH_PATH, params={
+            'q': self.query,
+            'sort': "created",
+            'order': opposite,
+            'per_page': 1,
+        })
+        times = sorted([
+            _parse_time(self._search.first_page()['items'][0]['created_at']),
+            _parse_time(last['items'][0]['created_at']),
+        ])
+        return times[0], times[1]
+
+    def _shard(self, start, end):
+        """Creates a search restricted to issues created within a range
+
+        Args:
+            start (datetime): Start of the range (inclusive)
+            end (datetime): End of the range (inclusive)
+
+        Returns:
+            IssueSearch: The search
+        """
+        query = "{} created:{}..{}".format(
+            self.query,
+            start.strftime(TIME_FORMAT),
+            end.strftime(TIME_FORMAT))
+        return IssueSearch(
+            self.client, query, sort="created", order=self.order, workers=1)
+
+
+def _parse_time(value):
+    return datetime.strptime(value, TIME_FORMAT)
+
+
+def _total_count(search):
+    return search.total_count
+
+
+def _fetch_pages(search):
+    return list(search.pages())
@@ -0,0 +1,109 @@
+"""
+Offline snapshots of search results
+
+A snapshot is a gzip-compressed JSON Lines file. The first line is a header
+describing the snapshot, and each following line is an issue as returned by
+the search API (including any attributes fetched with GraphQL). Snapshots are
+written and read one issue at a time, so they never need to fit in memory.
+
+Attributes:
+    SNAPSHOT_FORMAT (str): Format name recorded in snapshot headers
+    SNAPSHOT_VERSION (int): Version of the snapshot format
+"""
+import gzip
+import json
+import time
+
+from .errors import GisrepError
+
+SNAPSHOT_FORMAT = "gisrep-snapshot"
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(path, query, issues, fields=()):
+    """Writes search results to a snapshot file
+
+    Args:
+        path (str): Path of the snapshot file
+        query (str): The Github search query
+        issues (iterable): Raw issue dictionaries
+        fields (iterable, optional): Attribute paths fetched with GraphQL
+
+    Returns:
+        int: Number of issues written
+    """
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'query': query,
+        'fetched_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        'fields': sorted('.'.join(path) for path in fields),
+    }
+
+    count = 0
+    with gzip.open(path, 'wt', encoding='utf-8') as snapshot_file:
+        snapshot_file.write(json.dumps(header) + '\n')
+        for issue in issues:
+            snapshot_file.write(
+                json.dumps(issue, separators=(',', ':')) + '\n')
+            count += 1
+    return count
+
+
+class Snapshot(object):
+
+    """Snapshot file of search results
+
+    Attributes:
+        path (str): Path of the snapshot file
+        header (dict): Header of the snapshot
+    """
+
+    def __init__(self, path):
+        """Opens a snapshot, reading its header
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Raises:
+            GisrepError: The file is not a supported snapshot
+        """
+        self.path = path
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as snapshot_file:
+                self.header = json.loads(snapshot_file.readline())
+        except (OSError, ValueError):
+            raise GisrepError("Couldn't read snapshot: {}".format(path))
+
+        if (not isinstance(self.header, dict) or
+                self.header.get('format') != SNAPSHOT_FORMAT):
+            raise GisrepError("Not a gisrep snapshot: {}".format(path))
+        if self.header.get('version') != SNAPSHOT_VERSION:
+            raise GisrepError(
+                "Unsupported snapshot version: {}".format(
+                    self.header.get('version')))
+
+    @property
+    def query(self):
+        """Gets the search query the snapshot was taken of
+
+        Returns:
+            str: The Github search query
+        """
+        return self.header['query']
+
+    @property
+    def fields(self):
+        """Gets the attributes that were fetched with GraphQL
+
+        Returns:
+            set: Attribute paths as tuples
+        """
+        return set(tuple(field.split('.')) for field in self.header['fields'])
+
+    def __iter__(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as snapshot_file:
+            # Skip the header
+            snapshot_file.readline()
+            for line in snapshot_file:
+                yield json.loads(line)
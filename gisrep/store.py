@@ -0,0 +1,341 @@
+"""
+Local SQLite index of Github issues
+
+Issues matched by a query are mirrored into a database, with their labels,
+milestones and assignees normalised into indexed tables. Later syncs of the
+same query only fetch issues updated since the previous sync. Reports can
+then be published from the index, evaluating a subset of the Github search
+syntax locally.
+
+Supported qualifiers are 'repo:', 'label:' (comma separated labels match any
+of them), 'milestone:', 'state:', 'is:' (open, closed, issue, pr), 'author:',
+'assignee:' and 'no:' (label, milestone, assignee). Qualifiers may be negated
+with a leading '-', and other words must appear in the title or body.
+
+Attributes:
+    DATABASE_FILE (str): Name of the issue database within a cache directory
+"""
+import json
+import os
+import shlex
+import sqlite3
+import threading
+
+from .errors import GisrepError
+from .search import ShardedSearch
+
+DATABASE_FILE = "issues.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT,
+    body TEXT,
+    state TEXT,
+    is_pull_request INTEGER NOT NULL,
+    author TEXT,
+    milestone_id INTEGER REFERENCES milestones (id),
+    created_at TEXT,
+    updated_at TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_repo ON issues (repo, state);
+CREATE INDEX IF NOT EXISTS issues_created_at ON issues (created_at);
+CREATE INDEX IF NOT EXISTS issues_milestone ON issues (milestone_id);
+CREATE INDEX IF NOT EXISTS issues_author ON issues (author);
+
+CREATE TABLE IF NOT EXISTS labels (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS issue_labels (
+    issue_id INTEGER NOT NULL REFERENCES issues (id),
+    label_id INTEGER NOT NULL REFERENCES labels (id),
+    PRIMARY KEY (issue_id, label_id)
+);
+CREATE INDEX IF NOT EXISTS issue_labels_label ON issue_labels (label_id);
+
+CREATE TABLE IF NOT EXISTS milestones (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS milestones_title ON milestones (title);
+
+CREATE TABLE IF NOT EXISTS issue_assignees (
+    issue_id INTEGER NOT NULL REFERENCES issues (id),
+    login TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (issue_id, login)
+);
+CREATE INDEX IF NOT EXISTS issue_assignees_login ON issue_assignees (login);
+
+CREATE TABLE IF NOT EXISTS syncs (
+    query TEXT PRIMARY KEY,
+    updated_at TEXT
+);
+"""
+
+
+class IssueStore(object):
+
+    """SQLite database of issues synced from Github
+
+    Attributes:
+        path (str): Path of the database file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the database
+        """
+        self._connection.close()
+
+    def last_synced(self, query):
+        """Gets the latest update seen by the last sync of a query
+
+        Args:
+            query (str): The Github search query
+
+        Returns:
+            str: Timestamp of the most recently updated issue, or None
+        """
+        row = self._connection.execute(
+            "SELECT updated_at FROM syncs WHERE query = ?",
+            (query,)).fetchone()
+        return row[0] if row is not None else None
+
+    def sync(self, client, query, workers=1):
+        """Fetches the issues matched by a query into the database
+
+        Only issues updated since the last sync of the query are fetched.
+        Issues updated at the same second as the latest issue seen are
+        fetched again, so that none are missed.
+
+        Args:
+            client (GithubClient): Client used to make requests
+            query (str): The Github search query
+            workers (int, optional): Number of pages to fetch concurrently
+
+        Returns:
+            int: Number of issues fetched
+        """
+        last = self.last_synced(query)
+        search = ShardedSearch(
+            client,
+            query if last is None else "{} updated:>={}".format(query, last),
+            workers=workers)
+
+        count = 0
+        latest = last
+        for items in search.pages():
+            self.add(items)
+            count += len(items)
+            for item in items:
+                if latest is None or item['updated_at'] > latest:
+                    latest = item['updated_at']
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO syncs (query, updated_at) "
+                "VALUES (?, ?)",
+                (query, latest))
+        return count
+
+    def add(self, items):
+        """Adds (or updates) issues in the database
+
+        Args:
+            items (list): Raw issues, as returned by the search API
+        """
+        with self._lock, self._connection:
+            for item in items:
+                self._add(item)
+
+    def search(self, query):
+        """Finds the issues in the database matching a query
+
+        Args:
+            query (str): The Github search query
+
+        Returns:
+            list: Raw issues, in order of creation
+
+        Raises:
+            GisrepError: The query uses an unsupported qualifier
+        """
+        conditions, params = _parse_query(query)
+        sql = "SELECT raw FROM issues"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at, id"
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _add(self, item):
+        """Adds (or updates) an issue, within a transaction
+
+        Args:
+            item (dict): Raw issue
+        """
+        execute = self._connection.execute
+        issue_id = item['id']
+
+        milestone = item.get('milestone')
+        if milestone is not None:
+            execute(
+                "INSERT OR REPLACE INTO milestones (id, title) VALUES (?, ?)",
+                (milestone['id'], milestone['title']))
+
+        execute(
+            "INSERT OR REPLACE INTO issues (id, repo, number, title, body, "
+            "state, is_pull_request, author, milestone_id, created_at, "
+            "updated_at, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                issue_id,
+                _repo_name(item['repository_url']),
+                item['number'],
+                item['title'],
+                item.get('body'),
+                item['state'],
+                int(item.get('pull_request') is not None),
+                (item.get('user') or {}).get('login'),
+                milestone['id'] if milestone is not None else None,
+                item['created_at'],
+                item['updated_at'],
+                json.dumps(item, separators=(',', ':')),
+            ))
+
+        # Replace the issue's labels and assignees
+        execute("DELETE FROM issue_labels WHERE issue_id = ?", (issue_id,))
+        for label in item.get('labels') or []:
+            execute(
+                "INSERT OR IGNORE INTO labels (name) VALUES (?)",
+                (label['name'],))
+            execute(
+                "INSERT OR IGNORE INTO issue_labels (issue_id, label_id) "
+                "SELECT ?, id FROM labels WHERE name = ?",
+                (issue_id, label['name']))
+
+        execute("DELETE FROM issue_assignees WHERE issue_id = ?", (issue_id,))
+        for assignee in item.get('assignees') or []:
+            execute(
+                "INSERT OR IGNORE INTO issue_assignees (issue_id, login) "
+                "VALUES (?, ?)",
+                (issue_id, assignee['login']))
+
+
+def _repo_name(repository_url):
+    """Gets the full name of a repository from its API URL
+
+    Args:
+        repository_url (str): e.g. https://api.github.com/repos/owner/name
+
+    Returns:
+        str: e.g. owner/name
+    """
+    return '/'.join(repository_url.rstrip('/').split('/')[-2:])
+
+
+def _parse_query(query):
+    """Translates a Github search query into SQL conditions
+
+    Args:
+        query (str): The Github search query
+
+    Returns:
+        tuple: List of SQL conditions and list of their parameters
+
+    Raises:
+        GisrepError: The query uses an unsupported qualifier
+    """
+    conditions = []
+    params = []
+    try:
+        terms = shlex.split(query)
+    except ValueError as exc:
+        raise GisrepError("Couldn't parse query: {}".format(exc))
+
+    for term in terms:
+        negate = term.startswith('-') and ':' in term
+        if negate:
+            term = term[1:]
+        qualifier, _, value = term.partition(':')
+        if not value:
+            # Plain words must appear in the title or body
+            condition = "(title LIKE ? OR body LIKE ?)"
+            params.extend(["%{}%".format(term)] * 2)
+        else:
+            condition = _qualifier_condition(qualifier.lower(), value, params)
+        conditions.append(
+            "NOT {}".format(condition) if negate else condition)
+    return conditions, params
+
+
+def _qualifier_condition(  # pylint: disable=too-many-return-statements
+        qualifier, value, params):
+    """Translates a search qualifier into an SQL condition
+
+    Args:
+        qualifier (str): The qualifier, e.g. 'label'
+        value (str): The qualifier's value
+        params (list): Parameters of the SQL conditions, updated in place
+
+    Returns:
+        str: The SQL condition
+
+    Raises:
+        GisrepError: The qualifier is not supported
+    """
+    if qualifier == 'repo':
+        params.append(value)
+        return "repo = ? COLLATE NOCASE"
+    if qualifier == 'label':
+        names = value.split(',')
+        params.extend(names)
+        return (
+            "EXISTS (SELECT 1 FROM issue_labels JOIN labels "
+            "ON labels.id = issue_labels.label_id "
+            "WHERE issue_labels.issue_id = issues.id "
+            "AND labels.name IN ({}))".format(', '.join('?' * len(names))))
+    if qualifier == 'milestone':
+        params.append(value)
+        return (
+            "milestone_id IN (SELECT id FROM milestones WHERE title = ?)")
+    if qualifier == 'author':
+        params.append(value)
+        return "author = ? COLLATE NOCASE"
+    if qualifier == 'assignee':
+        params.append(value)
+        return (
+            "EXISTS (SELECT 1 FROM issue_assignees "
+            "WHERE issue_assignees.issue_id = issues.id AND login = ?)")
+    if qualifier in ('state', 'is') and value in ('open', 'closed'):
+        params.append(value)
+        return "state = ?"
+    if qualifier in ('is', 'type') and value == 'issue':
+        return "is_pull_request = 0"
+    if qualifier in ('is', 'type') and value in ('pr', 'pull-request'):
+        return "is_pull_request = 1"
+    if qualifier == 'no' and value == 'label':
+        return (
+            "NOT EXISTS (SELECT 1 FROM issue_labels "
+            "WHERE issue_labels.issue_id = issues.id)")
+    if qualifier == 'no' and value == 'milestone':
+        return "milestone_id IS NULL"
+    if qualifier == 'no' and value == 'assignee':
+        return (
+            "NOT EXISTS (SELECT 1 FROM issue_assignees "
+            "WHERE issue_assignees.issue_id = issues.id)")
+    raise GisrepError(
+        "Qualifier not supported by local reports: {}:{}".format(
+            qualifier, value))
@@ -0,0 +1,89 @@
+"""
+Grouping of issues for templates that report issues by label, milestone or
+assignee
+
+Template modules can build the groups in their get_context function, so that
+templates look up each group's issues instead of testing every issue against
+every group.
+"""
+from collections import OrderedDict
+
+
+class IssueGroups(object):
+
+    """Issues grouped by label, milestone and assignee, built in one pass
+
+    Groups are keyed by label name, milestone title and assignee login, and
+    are ordered by when they are first seen. Issues keep their original order
+    within each group.
+
+    Attributes:
+        issues (list): All of the issues
+        labels (list): Distinct labels, in order of first appearance
+        milestones (list): Distinct milestones, in order of first appearance
+        assignees (list): Distinct assignees, in order of first appearance
+        by_label (OrderedDict): Issues keyed by label name
+        by_milestone (OrderedDict): Issues keyed by milestone title
+        by_assignee (OrderedDict): Issues keyed by assignee login
+        unlabelled (list): Issues without labels
+        no_milestone (list): Issues without a milestone
+        unassigned (list): Issues without assignees
+    """
+
+    def __init__(self, issues):
+        self.issues = list(issues)
+        self.labels = []
+        self.milestones = []
+        self.assignees = []
+        self.by_label = OrderedDict()
+        self.by_milestone = OrderedDict()
+        self.by_assignee = OrderedDict()
+        self.unlabelled = []
+        self.no_milestone = []
+        self.unassigned = []
+
+        for issue in self.issues:
+            self._add(issue)
+
+    def _add(self, issue):
+        """Adds an issue to its groups
+
+        Args:
+            issue (object): The issue
+        """
+        if not issue.labels:
+            self.unlabelled.append(issue)
+        for label in issue.labels:
+            _add_to_group(
+                self.by_label, self.labels, label.name, label, issue)
+
+        if issue.milestone is None:
+            self.no_milestone.append(issue)
+        else:
+            _add_to_group(
+                self.by_milestone, self.milestones,
+                issue.milestone.title, issue.milestone, issue)
+
+        if not issue.assignees:
+            self.unassigned.append(issue)
+        for assignee in issue.assignees:
+            _add_to_group(
+                self.by_assignee, self.assignees,
+                assignee.login, assignee, issue)
+
+
+def _add_to_group(groups, keys, name, key, issue):
+    """Adds an issue to a group, creating the group if it is new
+
+    Args:
+        groups (OrderedDict): Issues keyed by group name
+        keys (list): Objects the groups are named after, in order
+        name (str): Name of the group
+        key (object): Object the group is named after
+        issue (object): The issue
+    """
+    group = groups.get(name)
+    if group is None:
+        group = groups[name] = []
+        keys.append(key)
+    group.append(issue)
@@ -1,28 +1,27 @@
 """Context function for list_by_labels.html.tplt
 
-Adds all_labels context
+Adds labels and the issues grouped by label to the context
 """
+from gisrep.templates.grouping import IssueGroups
+
+# Attributes used by IssueGroups
+ISSUE_FIELDS = ['labels.name', 'milestone.title', 'assignees.login']
 
 
 def get_context(issues):
-    """Adds the all_labels list of labels
+    """Groups the issues by label
 
     Args:
-        issues (list): List of github.Issue.Issue objects
+        issues (list): List of gisrep.models.Issue records
 
     Returns:
         dict: Context dictionary passed to list_by_labels.html.tplt template
     """
-    labels = []
-    unlabelled = []
-    for issue in issues:
-        if not issue.labels:
-            unlabelled.append(issue)
-        else:
-            labels.extend([l for l in issue.labels if l not in labels])
+    groups = IssueGroups(issues)
 
     return {
-        'labels': labels,
+        'labels': groups.labels,
         'issues': issues,
-        'unlabelled': unlabelled,
+        'issues_by_label': groups.by_label,
+        'unlabelled': groups.unlabelled,
     }
@@ -1,16 +1,29 @@
 """
 Module that defines how templates are located
+
+Attributes:
+    ISSUE_COLLECTION (str): Context variable holding the issues
+    ISSUE_VARIABLE (str): Template variable name that always refers to an
+        issue
+    TEMPLATES_DIR (str): Name of the compiled template cache within a cache
+        directory
+    ASYNC_TEMPLATES_DIR (str): Name of the compiled asynchronous template
+        cache within a cache directory
 """
 import importlib.util
 import os
 
 from jinja2 import (
-    Environment, FileSystemLoader, PackageLoader, exceptions,
-    select_autoescape)
+    Environment, FileSystemBytecodeCache, FileSystemLoader, PackageLoader,
+    exceptions, nodes, select_autoescape)
 
 from ..errors import GisrepError
 
 TEMPLATE_EXTENSION = 'tplt'
+TEMPLATES_DIR = 'templates'
+ASYNC_TEMPLATES_DIR = 'templates-async'
+ISSUE_COLLECTION = 'issues'
+ISSUE_VARIABLE = 'issue'
 
 
 class TemplateManager(object):
@@ -18,24 +31,46 @@ class TemplateManager(object):
     Class for template manager. The template manager class locates templates
     used for generating reports
 
+    Compiled templates are cached in a cache directory, if one is supplied,
+    so that templates are only parsed and compiled when they change.
+
+    Asynchronous managers render templates with stream_async, which may be
+    given issues as they are fetched by an asynchronous generator.
+
     Attributes:
         env (jinja2.Environment): Jinja2 templating environment
 
     """
 
-    def __init__(self, loader):
+    # Template modules imported by any manager, keyed by path
+    _modules = {}
+
+    def __init__(self, loader, cache_dir=None, enable_async=False):
+        bytecode_cache = None
+        if cache_dir is not None:
+            # Asynchronous templates are compiled to different code
+            directory = os.path.join(
+                cache_dir,
+                ASYNC_TEMPLATES_DIR if enable_async else TEMPLATES_DIR)
+            os.makedirs(directory, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(directory)
+
         self.env = Environment(
             loader=loader,
             trim_blocks=True,
             lstrip_blocks=True,
-            autoescape=select_autoescape(['html', 'xml']))
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=bytecode_cache,
+            enable_async=enable_async)
+        self._fields = {}
 
     def generate(self, filename, issues):
         """Generates a report
 
         Args:
             filename (str): The filename of the template to use
-            issues (github.Issue.Issue): The issues to report
+            issues (list): The issues to report, as gisrep.models.Issue
+                records (or github.Issue.Issue objects)
 
         Returns:
             str: The report
@@ -45,22 +80,98 @@ class TemplateManager(object):
         """
 
         # Load the template
-        try:
-            template = self.env.get_template(
-                "{0}.{1}".format(filename, TEMPLATE_EXTENSION))
-        except exceptions.TemplateNotFound:
-            raise GisrepError("Couldn't find template: {}".format(filename))
+        template = self._get_template(filename)
+
+        # Render the template
+        return template.render(self._get_context(template, issues))
+
+    def stream(self, filename, issues):
+        """Generates a report piece by piece
+
+        If the template has no custom logic, the issues may be any iterable
+        (such as a generator yielding issues as they are fetched) and will
+        only be iterated as the template reaches them. Otherwise they are
+        collected into a list before calling get_context.
+
+        Args:
+            filename (str): The filename of the template to use
+            issues (iterable): The issues to report, as gisrep.models.Issue
+                records (or github.Issue.Issue objects)
+
+        Returns:
+            generator: Yields the report in pieces, as they are rendered
+
+        Raises:
+            GisrepError: Template not found
+        """
+
+        # Load the template
+        template = self._get_template(filename)
+
+        # Render the template lazily
+        return template.generate(self._get_context(template, issues))
+
+    async def stream_async(self, filename, issues):
+        """Generates a report piece by piece, with an asynchronous manager
+
+        If the template has no custom logic, the issues are only iterated as
+        the template reaches them, so rendering overlaps with fetching them.
+        Otherwise they are collected into a list before calling get_context.
+
+        Args:
+            filename (str): The filename of the template to use
+            issues (async iterable): The issues to report, as
+                gisrep.models.Issue records (or github.Issue.Issue objects)
+
+        Yields:
+            str: The report in pieces, as they are rendered
+
+        Raises:
+            GisrepError: Template not found
+        """
+
+        # Load the template
+        template = self._get_template(filename)
 
         # Check if corresponding module
-        module_path = os.path.splitext(template.filename)[0] + '.py'
-        context = {'issues': issues}
-        if os.path.exists(module_path):
-            # Module defines get_context
-            module = TemplateManager.import_module(module_path)
-            context = module.get_context(issues)
+        module = self._get_module(template)
+        if module is None:
+            context = {'issues': issues}
+        else:
+            context = module.get_context([issue async for issue in issues])
 
-        # Render the template
-        return template.render(context)
+        # Render the template lazily
+        async for chunk in template.generate_async(context):
+            yield chunk
+
+    def get_fields(self, filename):
+        """Gets the issue attributes used by a template
+
+        Attributes are found by analysing the template source, and may be
+        supplemented by an ISSUE_FIELDS list of dotted attribute names in
+        the template's module.
+
+        Args:
+            filename (str): The filename of the template
+
+        Returns:
+            set: Attribute paths as tuples, e.g. ('user', 'login')
+        """
+        template = self._get_template(filename)
+        module = self._get_module(template)
+
+        # Templates and modules are replaced when they are modified
+        fields = self._fields.get((template, module))
+        if fields is None:
+            source = self.env.loader.get_source(self.env, template.name)[0]
+            fields = find_issue_fields(self.env.parse(source))
+            if module is not None:
+                fields.update(
+                    tuple(field.split('.')[:2])
+                    for field in getattr(module, 'ISSUE_FIELDS', []))
+            self._fields[(template, module)] = fields
+
+        return set(fields)
 
     def list(self):
         """Lists the available templates
@@ -79,6 +190,72 @@ class TemplateManager(object):
 
         return templates
 
+    def _get_context(self, template, issues):
+        """Gets the context a template is rendered with
+
+        Args:
+            template (jinja2.Template): The template
+            issues (iterable): The issues to report
+
+        Returns:
+            dict: The context
+        """
+
+        # Check if corresponding module
+        module = self._get_module(template)
+        if module is None:
+            return {'issues': issues}
+
+        # Module defines get_context
+        if not isinstance(issues, list):
+            issues = list(issues)
+        return module.get_context(issues)
+
+    def _get_template(self, filename):
+        """Loads a template
+
+        Args:
+            filename (str): The filename of the template
+
+        Returns:
+            jinja2.Template: The template
+
+        Raises:
+            GisrepError: Template not found
+        """
+        try:
+            return self.env.get_template(
+                "{0}.{1}".format(filename, TEMPLATE_EXTENSION))
+        except exceptions.TemplateNotFound:
+            raise GisrepError("Couldn't find template: {}".format(filename))
+
+    @staticmethod
+    def _get_module(template):
+        """Gets the module corresponding to a template, if there is one
+
+        Modules are only imported again if they have been modified since they
+        were last imported.
+
+        Args:
+            template (jinja2.Template): The template
+
+        Returns:
+            module: The module, or None
+        """
+        module_path = os.path.splitext(template.filename)[0] + '.py'
+        try:
+            mtime = os.stat(module_path).st_mtime
+        except OSError:
+            return None
+
+        cached = TemplateManager._modules.get(module_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        module = TemplateManager.import_module(module_path)
+        TemplateManager._modules[module_path] = (mtime, module)
+        return module
+
     @staticmethod
     def import_module(module_path):
         """Imports the specified module dynamically
@@ -107,17 +284,106 @@ class TemplateManager(object):
         return module
 
 
+def find_issue_fields(ast):
+    """Finds the issue attributes accessed in a parsed template
+
+    Issues are the elements of the 'issues' context variable and any variable
+    named 'issue'. Elements of an issue's lists (e.g. 'issue.labels') are
+    followed too, so attributes are found as paths of at most two names.
+
+    Args:
+        ast (jinja2.nodes.Template): The parsed template
+
+    Returns:
+        set: Attribute paths as tuples, e.g. ('user', 'login')
+    """
+    fields = set()
+    _find_issue_fields(ast, {ISSUE_VARIABLE: ()}, fields)
+    return fields
+
+
+def _find_issue_fields(node, bindings, fields):
+    """Recursively finds the issue attributes accessed in a template node
+
+    Args:
+        node (jinja2.nodes.Node): The node
+        bindings (dict): Attribute paths of the variables referring to issues
+        fields (set): Attribute paths found so far, updated in place
+    """
+    if isinstance(node, nodes.Getattr):
+        path = _issue_path(node, bindings)
+        if path:
+            fields.add(path[:2])
+
+    elif isinstance(node, nodes.For):
+        # Loop variables iterating over issues (or their lists) are issues
+        if (isinstance(node.iter, nodes.Name) and
+                node.iter.name == ISSUE_COLLECTION):
+            path = ()
+        else:
+            path = _issue_path(node.iter, bindings) or None
+        scope = dict(bindings)
+        targets = [node.target] + list(node.target.find_all(nodes.Name))
+        for target in targets:
+            if isinstance(target, nodes.Name):
+                scope.pop(target.name, None)
+                if path is not None:
+                    scope[target.name] = path
+
+        _find_issue_fields(node.iter, bindings, fields)
+        children = node.body + node.else_
+        if node.test is not None:
+            children.append(node.test)
+        for child in children:
+            _find_issue_fields(child, scope, fields)
+        return
+
+    elif isinstance(node, nodes.Macro):
+        # Macro arguments shadow variables of the same name
+        scope = dict(bindings)
+        for argument in node.args:
+            scope.pop(argument.name, None)
+            if argument.name == ISSUE_VARIABLE:
+                scope[argument.name] = ()
+        for child in node.body:
+            _find_issue_fields(child, scope, fields)
+        return
+
+    for child in node.iter_child_nodes():
+        _find_issue_fields(child, bindings, fields)
+
+
+def _issue_path(node, bindings):
+    """Gets the issue attribute path of an expression
+
+    Args:
+        node (jinja2.nodes.Expr): The expression
+        bindings (dict): Attribute paths of the variables referring to issues
+
+    Returns:
+        tuple: The attribute path, or None if the expression is not rooted
+            in an issue
+    """
+    attributes = []
+    while isinstance(node, nodes.Getattr):
+        attributes.append(node.attr)
+        node = node.node
+    if isinstance(node, nodes.Name) and node.name in bindings:
+        return bindings[node.name] + tuple(reversed(attributes))
+    return None
+
+
 class ExternalTemplateManager(TemplateManager):
 
     """Template manager that fetches user templates (external)
     """
 
-    def __init__(self, template_path):
+    def __init__(self, template_path, cache_dir=None, enable_async=False):
         # Create the template loader
         loader = FileSystemLoader(template_path)
 
         # Call the parent constructor with our loader
-        super().__init__(loader)
+        super().__init__(loader, cache_dir, enable_async)
 
 
 class InternalTemplateManager(TemplateManager):
@@ -125,9 +391,9 @@ class InternalTemplateManager(TemplateManager):
     """Template manager that fetches package templates (internal)
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir=None, enable_async=False):
         # Create the template loader
         loader = PackageLoader('gisrep', 'templates')
 
         # Call the parent constructor with our loader
-        super().__init__(loader)
+        super().__init__(loader, cache_dir, enable_async)
@@ -5,12 +5,21 @@ Attributes:
     TEST_INITIAL_CONFIG (TYPE): Description
 """
 
+from datetime import datetime, timedelta
+import json
 import os
+import re
 
+from click.testing import CliRunner
 import keyring
 import pytest
+import requests
 
+from gisrep.client import GithubClient
 from gisrep.config import Config
+from gisrep.gisrep import cli
+from gisrep.search import MAX_RESULTS, SEARCH_PATH, TIME_FORMAT
+from gisrep.snapshot import write_snapshot
 
 TEST_INITIAL_CONFIG = {
     'username': "my_name",
@@ -69,3 +78,257 @@ def config(tmpdir):  # pylint: disable=redefined-outer-name
     return Config(
         os.path.join(str(tmpdir), '.gisreprc'),
         initial_config=TEST_INITIAL_CONFIG)
+
+
+def make_raw_issue(number, labels=(), **fields):
+    """Creates an issue dictionary as returned by the search API
+
+    Args:
+        number (int): Issue number
+        labels (tuple, optional): Names of the issue's labels
+        **fields: Fields overriding the defaults
+
+    Returns:
+        dict: Raw issue
+    """
+    created_at = datetime(2018, 1, 1)
+    url = "https://api.github.com/repos/owner/repo/issues/{}".format(number)
+    issue = {
+        'id': 1000 + number,
+        'node_id': "I_{}".format(number),
+        'number': number,
+        'title': "Issue {}".format(number),
+        'state': 'open',
+        'body': "Body of issue {}".format(number),
+        'url': url,
+        'html_url': "https://github.com/owner/repo/issues/{}".format(number),
+        'repository_url': "https://api.github.com/repos/owner/repo",
+        'comments_url': url + "/comments",
+        'events_url': url + "/events",
+        'comments': 0,
+        'created_at': (
+            created_at + timedelta(hours=number)).strftime(TIME_FORMAT),
+        'updated_at': (
+            created_at + timedelta(days=1, hours=number)).strftime(
+                TIME_FORMAT),
+        'closed_at': None,
+        'user': {'login': "user{}".format(number % 3), 'id': number % 3},
+        'labels': [
+            {
+                'name': name,
+                'color': "ffffff",
+                'default': False,
+                'url': "https://api.github.com/repos/owner/repo/labels/"
+                       + name,
+            }
+            for name in labels],
+        'milestone': None,
+        'assignees': [],
+    }
+    issue.update(fields)
+    return issue
+
+
+class FakeResponse(object):
+
+    """Mocks a requests.Response
+
+    Attributes:
+        status_code (int): HTTP status code
+        headers (dict): Response headers
+        reason (str): HTTP reason phrase
+    """
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.reason = "Reason"
+        self._data = data
+
+    def json(self):
+        """Returns the decoded body
+
+        Returns:
+            object: Decoded JSON body
+        """
+        if self._data is None:
+            raise ValueError("No content")
+        return self._data
+
+
+class FakeSession(object):
+
+    """Mocks a requests.Session serving search results
+
+    Attributes:
+        issues (list): Raw issues served by the search API
+        resources (dict): Lists of raw resources served at other URLs
+        requests (list): Tuples of (url, params, headers) for each request
+    """
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.resources = {}
+        self.requests = []
+        self.headers = {}
+        self.auth = None
+
+    def get(self, url, params=None, headers=None):
+        """Serves a GET request
+
+        Args:
+            url (str): Request URL
+            params (dict, optional): Query parameters
+            headers (dict, optional): Request headers
+
+        Returns:
+            FakeResponse: The response
+        """
+        self.requests.append((url, params, headers or {}))
+        if not url.endswith(SEARCH_PATH):
+            return self._get_resource(url, params)
+
+        # Apply any date ranges and ordering to the issues
+        issues = self.issues
+        created = re.search(r'created:(\S+)\.\.(\S+)', params['q'])
+        if created:
+            issues = [
+                issue for issue in issues
+                if created.group(1) <= issue['created_at'] <= created.group(2)]
+        updated = re.search(r'updated:>=(\S+)', params['q'])
+        if updated:
+            issues = [
+                issue for issue in issues
+                if issue['updated_at'] >= updated.group(1)]
+        issues = sorted(
+            issues,
+            key=lambda issue: issue['created_at'],
+            reverse=params.get('order') == 'desc')
+
+        # Serve the page, limited to the first 1000 results
+        per_page = params['per_page']
+        start = (params.get('page', 1) - 1) * per_page
+        end = min(start + per_page, MAX_RESULTS)
+        data = {
+            'total_count': len(issues),
+            'incomplete_results': False,
+            'items': issues[start:end],
+        }
+        etag = '"{}"'.format(hash(json.dumps(data, sort_keys=True)))
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304, headers={'ETag': etag})
+        return FakeResponse(200, data, headers={'ETag': etag})
+
+    def _get_resource(self, url, params):
+        """Serves a page of the resources at a URL
+
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+
+        Returns:
+            FakeResponse: The response
+        """
+        if url not in self.resources:
+            return FakeResponse(404, {'message': "Not Found"})
+        start = (params['page'] - 1) * params['per_page']
+        return FakeResponse(
+            200, self.resources[url][start:start + params['per_page']])
+
+
+@pytest.fixture
+def fake_client():
+    """Fixture that provides a client for a fake Github API
+
+    Returns:
+        GithubClient: Client whose session serves 250 fake issues
+    """
+    client = GithubClient()
+    client._session = FakeSession(  # pylint: disable=protected-access
+        [make_raw_issue(number) for number in range(1, 251)])
+    return client
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    """Fixture that makes every requests session serve fake search results
+
+    Args:
+        monkeypatch (MonkeyPatch): Pytest monkeypatch fixture
+
+    Returns:
+        FakeSession: Session serving 250 fake issues, shared by all clients
+    """
+    session = FakeSession(
+        [make_raw_issue(number) for number in range(1, 251)])
+
+    def get(_, url, params=None, headers=None, **__):
+        return session.get(url, params=params, headers=headers)
+
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return session
+
+
+def run_gisrep(*args):
+    """Runs the gisrep command line tool
+
+    Args:
+        *args: Command line arguments
+
+    Returns:
+        click.testing.Result: Result of the command
+    """
+    return CliRunner().invoke(
+        cli, list(args), obj={'is_internal_template': False})
+
+
+def make_raw_issues(count):
+    """Creates a realistic mix of raw issues
+
+    Issues have between zero and three of eight labels, one of five
+    milestones (or none) and up to two of six assignees.
+
+    Args:
+        count (int): Number of issues
+
+    Returns:
+        list: Raw issues
+    """
+    labels = [
+        'bug', 'feature', 'docs', 'question', 'wontfix', 'duplicate',
+        'security', 'performance']
+    users = [
+        {'login': "user{}".format(index), 'id': index}
+        for index in range(6)]
+    issues = []
+    for number in range(1, count + 1):
+        milestone = number % 6
+        issues.append(make_raw_issue(
+            number,
+            labels=[labels[(number + i * 3) % 8] for i in range(number % 4)],
+            state='open' if number % 3 else 'closed',
+            milestone=(
+                {
+                    'id': milestone,
+                    'title': "v{}.0".format(milestone),
+                    'number': milestone,
+                }
+                if milestone else
+                None),
+            assignees=users[number % 5:number % 5 + number % 3]))
+    return issues
+
+
+@pytest.fixture(scope='session')
+def large_snapshot(tmpdir_factory):
+    """Fixture that provides a snapshot of 5000 issues
+
+    Args:
+        tmpdir_factory (TempdirFactory): Pytest temporary directory factory
+
+    Returns:
+        str: Path of the snapshot file
+    """
+    path = str(tmpdir_factory.mktemp('snapshots').join('large.snap'))
+    write_snapshot(path, "repo:owner/repo", make_raw_issues(5000))
+    return path
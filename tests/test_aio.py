@@ -0,0 +1,73 @@
+"""
+Tests the aio module and asynchronous reports
+"""
+
+import pytest
+
+from .conftest import make_raw_issue, run_gisrep
+from .test_expansion import make_raw_comments
+
+COMMENTS_TEMPLATE = (
+    "{% for issue in issues %}"
+    "{{ issue.number }}:"
+    "{% for comment in issue.comment_list %}{{ comment.body }};{% endfor %}\n"
+    "{% endfor %}")
+
+
+@pytest.mark.parametrize(
+    'internal', ['simple_report.md', 'list_by_labels.html'])
+def test_async_report(fake_session, internal):
+    """Tests asynchronous reports match synchronous ones
+
+    Args:
+        fake_session (FakeSession): Session serving fake search results
+        internal (str): Tag of an internal template
+    """
+    searched = run_gisrep('report', "is:open", '--internal', internal)
+
+    result = run_gisrep(
+        'report', "is:open", '--internal', internal, '--async', '--no-cache')
+
+    assert result.exit_code == 0, result.output
+    assert result.output == searched.output
+
+
+def test_async_expansions(tmpdir, fake_session):
+    """Tests issues are expanded and rendered in order
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_session (FakeSession): Session serving fake search results
+    """
+    fake_session.issues = [
+        make_raw_issue(number, comments=number % 3)
+        for number in range(1, 251)]
+    for issue in fake_session.issues:
+        fake_session.resources[issue['comments_url']] = make_raw_comments(
+            issue, issue['comments'])
+    template = tmpdir.join('comments.txt.tplt')
+    template.write(COMMENTS_TEMPLATE)
+
+    searched = run_gisrep(
+        'report', "is:open", '--external', str(template), '--no-cache')
+    result = run_gisrep(
+        'report', "is:open", '--external', str(template), '--async',
+        '--no-cache')
+
+    assert result.exit_code == 0, result.output
+    assert result.output == searched.output
+    lines = result.output.splitlines()
+    assert [int(line.split(':')[0]) for line in lines] == list(range(1, 251))
+    assert lines[1] == "2:Comment 0 on 2;Comment 1 on 2;"
+
+
+def test_async_snapshot(large_snapshot):
+    """Tests asynchronous reports must search Github
+
+    Args:
+        large_snapshot (str): Path of a snapshot of 5000 issues
+    """
+    result = run_gisrep(
+        'report', '--from-snapshot', large_snapshot, '--async')
+
+    assert result.exit_code != 0
@@ -0,0 +1,78 @@
+"""
+Tests the batch module and command
+"""
+
+import pytest
+
+from gisrep.batch import read_manifest
+from gisrep.errors import GisrepError
+
+from .conftest import run_gisrep
+from .test_template_manager import EXTERNAL_TEMPLATE_TAG, TEST_DATA_DIR
+
+MANIFEST = """
+[[report]]
+query = "is:open"
+output = "open.md"
+
+[[report]]
+query = "is:open"
+internal = "list_by_labels.html"
+output = "open.html"
+
+[[report]]
+query = "is:closed"
+external = "{}"
+output = "closed.txt"
+""".format(TEST_DATA_DIR + '/' + EXTERNAL_TEMPLATE_TAG + '.tplt')
+
+
+def test_read_manifest(tmpdir):
+    """Tests reading reports from a manifest
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    manifest = tmpdir.join('manifest.toml')
+    manifest.write(MANIFEST)
+
+    jobs = read_manifest(str(manifest))
+
+    assert [job.query for job in jobs] == ["is:open", "is:open", "is:closed"]
+    assert jobs[0].internal is None and jobs[0].external is None
+    assert jobs[1].internal == "list_by_labels.html"
+    assert jobs[2].output == str(tmpdir.join('closed.txt'))
+
+
+def test_invalid_manifest(tmpdir):
+    """Tests reports without an output are rejected
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    manifest = tmpdir.join('manifest.toml')
+    manifest.write('[[report]]\nquery = "is:open"\n')
+
+    with pytest.raises(GisrepError):
+        read_manifest(str(manifest))
+
+
+def test_batch(tmpdir, fake_session):
+    """Tests reports sharing a query are fetched once
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_session (FakeSession): Session serving fake search results
+    """
+    manifest = tmpdir.join('manifest.toml')
+    manifest.write(MANIFEST)
+
+    result = run_gisrep('batch', str(manifest), '--no-cache')
+
+    assert result.exit_code == 0, result.output
+    queries = [params['q'] for _, params, _ in fake_session.requests]
+    assert queries.count("is:open") == 3
+    assert queries.count("is:closed") == 3
+    assert tmpdir.join('open.md').read().startswith("- Issue 1 [#1]")
+    assert tmpdir.join('open.html').read().startswith("<html>")
+    assert tmpdir.join('closed.txt').read().startswith("123")
@@ -0,0 +1,83 @@
+"""
+Tests the cache module
+"""
+
+import os
+
+from gisrep.cache import ResponseCache
+from gisrep.search import IssueSearch
+
+
+def test_put_get(tmpdir):
+    """Tests a stored response can be retrieved
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    cache = ResponseCache(str(tmpdir))
+    key = cache.key("https://api.github.com/search/issues", {'page': 1})
+    assert cache.get(key) is None
+
+    cache.put(key, {'items': []}, etag='"abc"')
+
+    entry = cache.get(key)
+    assert entry['etag'] == '"abc"'
+    assert entry['last_modified'] is None
+    assert entry['data'] == {'items': []}
+
+
+def test_key():
+    """Tests keys distinguish requests by parameters and user
+    """
+    url = "https://api.github.com/search/issues"
+    keys = {
+        ResponseCache.key(url, {'q': "is:open", 'page': 1}),
+        ResponseCache.key(url, {'q': "is:open", 'page': 2}),
+        ResponseCache.key(url, {'q': "is:closed", 'page': 1}),
+        ResponseCache.key(url, {'q': "is:open", 'page': 1}, 'someone'),
+    }
+    assert len(keys) == 4
+
+
+def test_lru_eviction(tmpdir):
+    """Tests least-recently-used entries are evicted beyond the size limit
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    cache = ResponseCache(str(tmpdir), max_size=250)
+    data = {'body': "x" * 50}
+    cache.put('first', data, etag='"1"')
+    cache.put('second', data, etag='"2"')
+
+    # Make 'first' the most recently used entry
+    os.utime(os.path.join(str(tmpdir), 'second.json'), (0, 0))
+    assert cache.get('first') is not None
+
+    # Adding a third entry should evict 'second'
+    cache.put('third', data, etag='"3"')
+    assert cache.get('first') is not None
+    assert cache.get('second') is None
+    assert cache.get('third') is not None
+
+
+def test_conditional_revalidation(tmpdir, fake_client):
+    """Tests repeated searches revalidate their cached pages
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    fake_client.cache = ResponseCache(str(tmpdir))
+    session = fake_client._session  # pylint: disable=protected-access
+
+    first = list(IssueSearch(fake_client, "is:open"))
+    assert all(
+        'If-None-Match' not in headers for _, _, headers in session.requests)
+
+    del session.requests[:]
+    second = list(IssueSearch(fake_client, "is:open"))
+    assert all(
+        'If-None-Match' in headers for _, _, headers in session.requests)
+    assert second == first
+    assert len(second) == 250
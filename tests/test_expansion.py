@@ -0,0 +1,91 @@
+"""
+Tests the expansion module
+"""
+
+from gisrep.expansion import PER_PAGE, expand, fetch_expansion
+from gisrep.models import Issue
+from gisrep.projection import Projection
+
+from .conftest import make_raw_issue
+
+
+def make_raw_comments(issue, count):
+    """Creates comment dictionaries as returned by the API
+
+    Args:
+        issue (dict): The raw issue commented on
+        count (int): Number of comments
+
+    Returns:
+        list: Raw comments
+    """
+    return [
+        {
+            'id': issue['number'] * 1000 + index,
+            'body': "Comment {} on {}".format(index, issue['number']),
+            'user': {'login': "user{}".format(index % 3)},
+            'created_at': issue['created_at'],
+            'updated_at': issue['created_at'],
+        }
+        for index in range(count)]
+
+
+def test_fetch_comments(fake_client):
+    """Tests every page of an issue's comments is fetched
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    session = fake_client._session  # pylint: disable=protected-access
+    issue = make_raw_issue(1, comments=PER_PAGE + 50)
+    comments = make_raw_comments(issue, PER_PAGE + 50)
+    session.resources[issue['comments_url']] = comments
+
+    assert fetch_expansion(fake_client, issue, 'comment_list') == comments
+    assert len(session.requests) == 2
+
+
+def test_no_comments(fake_client):
+    """Tests comments aren't fetched for issues without any
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    session = fake_client._session  # pylint: disable=protected-access
+
+    issue = make_raw_issue(1)
+
+    assert fetch_expansion(fake_client, issue, 'comment_list') == []
+    assert session.requests == []
+
+
+def test_linked_pulls(fake_client):
+    """Tests pull requests referencing an issue are found in its timeline
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    session = fake_client._session  # pylint: disable=protected-access
+    issue = make_raw_issue(1)
+    pull = make_raw_issue(2, pull_request={'url': "pulls/2"})
+    session.resources[issue['url'] + '/timeline'] = [
+        {'event': 'labeled'},
+        {'event': 'cross-referenced', 'source': {'issue': make_raw_issue(3)}},
+        {'event': 'cross-referenced', 'source': {'issue': pull}},
+    ]
+
+    expand(fake_client, [issue], ['linked_pulls'])
+
+    assert issue['linked_pulls'] == [pull]
+    assert Issue.from_raw(issue).linked_pulls[0].number == 2
+
+
+def test_projection_expansions():
+    """Tests expansions are only fetched for templates using them
+    """
+    projection = Projection({
+        ('title',), ('comment_list', 'body'), ('comment_list', 'user')})
+
+    assert projection.expansions == ['comment_list']
+    assert projection.fetched_fields == [('comment_list',)]
+    assert Projection({('title',)}).expansions == []
@@ -4,9 +4,10 @@ Tests the gisrep module
 
 import os
 
+from gisrep.errors import GisrepError
 from gisrep.gisrep import _get_credentials, _get_template_manager
 
-from .conftest import TEST_INITIAL_CONFIG
+from .conftest import TEST_INITIAL_CONFIG, run_gisrep
 from .test_template_manager import (
     EXTERNAL_TEMPLATE_TAG, INTERNAL_TEMPLATE_TAG, TEST_DATA_DIR,
     assert_external_list, assert_internal_list)
@@ -53,3 +54,39 @@ def test_external_template_manager():
     # Assert returned variables are correct
     assert tag == "test_template"
     assert_external_list(manager)
+
+
+def test_report_multiple_templates(tmpdir, fake_session):
+    """Tests one search can be published with several templates
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_session (FakeSession): Session serving fake search results
+    """
+    markdown = tmpdir.join('report.md')
+    html = tmpdir.join('report.html')
+
+    result = run_gisrep(
+        'report', "is:open", '--no-cache',
+        '--internal', 'simple_report.md', '--output', str(markdown),
+        '--internal', 'list_by_labels.html', '--output', str(html))
+
+    assert result.exit_code == 0, result.output
+    assert len(fake_session.requests) == 3
+    assert markdown.read().startswith("- Issue 1 [#1]")
+    assert html.read().startswith("<html>")
+
+
+def test_report_missing_output(fake_session):
+    """Tests each template must have an output
+
+    Args:
+        fake_session (FakeSession): Session serving fake search results
+    """
+    result = run_gisrep(
+        'report', "is:open", '--no-cache',
+        '--internal', 'simple_report.md',
+        '--internal', 'list_by_labels.html')
+
+    assert isinstance(result.exception, GisrepError)
+    assert fake_session.requests == []
@@ -0,0 +1,46 @@
+"""
+Tests the grouping module
+"""
+
+from gisrep.models import Issue
+from gisrep.templates.grouping import IssueGroups
+
+from .conftest import make_raw_issue
+
+
+def test_groups():
+    """Tests issues are grouped by label, milestone and assignee in order
+    """
+    alice = {'login': "alice"}
+    bob = {'login': "bob"}
+    issues = [
+        Issue.from_raw(make_raw_issue(
+            1, labels=('feature',), milestone={'title': "v2"},
+            assignees=[alice])),
+        Issue.from_raw(make_raw_issue(
+            2, labels=('bug', 'feature'), assignees=[bob, alice])),
+        Issue.from_raw(make_raw_issue(3, milestone={'title': "v1"})),
+        Issue.from_raw(make_raw_issue(
+            4, labels=('bug',), milestone={'title': "v2"})),
+    ]
+
+    groups = IssueGroups(issues)
+
+    assert [label.name for label in groups.labels] == ['feature', 'bug']
+    assert _numbers(groups.by_label) == {'feature': [1, 2], 'bug': [2, 4]}
+    assert [issue.number for issue in groups.unlabelled] == [3]
+
+    assert [milestone.title for milestone in groups.milestones] == [
+        "v2", "v1"]
+    assert _numbers(groups.by_milestone) == {'v2': [1, 4], 'v1': [3]}
+    assert [issue.number for issue in groups.no_milestone] == [2]
+
+    assert list(groups.by_assignee) == ['alice', 'bob']
+    assert _numbers(groups.by_assignee) == {'alice': [1, 2], 'bob': [2]}
+    assert [issue.number for issue in groups.unassigned] == [3, 4]
+
+
+def _numbers(groups):
+    return {
+        name: [issue.number for issue in issues]
+        for name, issues in groups.items()}
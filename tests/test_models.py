@@ -0,0 +1,67 @@
+"""
+Tests the models module
+"""
+
+from datetime import datetime
+
+from gisrep.models import Issue, Label, Milestone, User
+from gisrep.projection import NESTED_SEARCH_FIELDS, SEARCH_FIELDS
+
+from .conftest import make_raw_issue
+
+
+def test_from_raw():
+    """Tests an issue record is built from a search result
+    """
+    raw = make_raw_issue(
+        3,
+        labels=('bug', 'feature'),
+        milestone={'title': "v1.0", 'due_on': "2018-03-01T00:00:00Z"})
+
+    issue = Issue.from_raw(raw)
+
+    assert issue.number == 3
+    assert issue.title == "Issue 3"
+    assert issue.user.login == "user0"
+    assert [label.name for label in issue.labels] == ['bug', 'feature']
+    assert issue.milestone.title == "v1.0"
+    assert issue.milestone.due_on == datetime(2018, 3, 1)
+    assert issue.created_at == datetime(2018, 1, 1, 3)
+    assert issue.pull_request is None
+    assert issue.assignees == ()
+
+
+def test_labels_compare_by_value():
+    """Tests the same label on different issues is equal and hashable
+    """
+    first = Issue.from_raw(make_raw_issue(1, labels=('bug',)))
+    second = Issue.from_raw(make_raw_issue(2, labels=('bug',)))
+
+    assert first.labels[0] == second.labels[0]
+    assert len({first.labels[0], second.labels[0]}) == 1
+    assert first.labels[0] in second.labels
+
+
+def test_records_are_compact():
+    """Tests records have no per-instance dictionary
+    """
+    issue = Issue.from_raw(make_raw_issue(1, labels=('bug',)))
+
+    for record in (issue, issue.user, issue.labels[0]):
+        assert not hasattr(record, '__dict__')
+
+
+def test_search_fields_provided():
+    """Tests records provide every attribute included in search results
+    """
+    records = {
+        'user': User,
+        'assignee': User,
+        'assignees': User,
+        'labels': Label,
+        'milestone': Milestone,
+    }
+
+    assert SEARCH_FIELDS <= set(Issue._fields)
+    for field, record in records.items():
+        assert NESTED_SEARCH_FIELDS[field] <= set(record._fields)
@@ -0,0 +1,74 @@
+"""
+Tests the projection module
+"""
+
+import pytest
+
+from gisrep.errors import GisrepError
+from gisrep.projection import Projection
+
+from .conftest import make_raw_issue
+
+
+class FakeGraphqlClient(object):
+
+    """Mocks the GraphQL API of a GithubClient
+
+    Attributes:
+        queries (list): Queries made to the client
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def graphql(self, query, variables):
+        """Returns a node for each requested ID
+
+        Args:
+            query (str): The GraphQL query
+            variables (dict): Variables of the query
+
+        Returns:
+            dict: The query data
+        """
+        self.queries.append(query)
+        return {'nodes': [
+            {'id': node_id, 'author': {'name': "Name " + node_id}}
+            for node_id in variables['ids']]}
+
+
+def test_search_fields():
+    """Tests attributes in search results need no further requests
+    """
+    client = FakeGraphqlClient()
+    projection = Projection({
+        ('title',), ('user', 'login'), ('labels', 'name'),
+        ('created_at', 'year')})
+
+    projection.complete(client, [make_raw_issue(1)])
+
+    assert projection.graphql_fields == []
+    assert client.queries == []
+
+
+def test_graphql_fields():
+    """Tests attributes missing from search results are fetched in bulk
+    """
+    client = FakeGraphqlClient()
+    projection = Projection({('title',), ('user', 'name')})
+    issues = [make_raw_issue(number) for number in range(1, 4)]
+
+    projection.complete(client, issues)
+
+    assert len(client.queries) == 1
+    assert [issue['user']['name'] for issue in issues] == [
+        "Name I_1", "Name I_2", "Name I_3"]
+
+
+def test_unsupported_fields():
+    """Tests templates using unavailable attributes fail before fetching
+    """
+    with pytest.raises(GisrepError):
+        Projection({('title',), ('user', 'followers')})
+    with pytest.raises(GisrepError):
+        Projection({('get_comments',)})
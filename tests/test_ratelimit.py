@@ -0,0 +1,174 @@
+"""
+Tests the ratelimit module
+"""
+
+import pytest
+
+from gisrep.errors import ApiError
+from gisrep.ratelimit import RateLimiter, is_throttled
+from gisrep.search import IssueSearch
+
+from .conftest import FakeResponse, FakeSession
+
+
+class FakeClock(object):
+
+    """Mocks the time, advancing it when sleeping
+
+    Attributes:
+        now (float): The current time
+        sleeps (list): Seconds slept for each time
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        """Gets the current time
+
+        Returns:
+            float: The current time
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """Advances the time
+
+        Args:
+            seconds (float): Seconds to sleep for
+        """
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottlingSession(FakeSession):
+
+    """Mocks a requests.Session that throttles requests for some pages
+
+    Attributes:
+        throttled (list): Pages to throttle once each, in order
+    """
+
+    def __init__(self, issues, throttled):
+        super().__init__(issues)
+        self.throttled = list(throttled)
+
+    def get(self, url, params=None, headers=None):
+        """Serves a GET request, throttling the next page to throttle
+
+        Args:
+            url (str): Request URL
+            params (dict, optional): Query parameters
+            headers (dict, optional): Request headers
+
+        Returns:
+            FakeResponse: The response
+        """
+        if self.throttled and params.get('page', 1) == self.throttled[0]:
+            self.throttled.pop(0)
+            return FakeResponse(
+                403,
+                {'message': "You have exceeded a secondary rate limit"},
+                headers={'Retry-After': "30"})
+        return super().get(url, params=params, headers=headers)
+
+
+@pytest.fixture
+def clock():
+    """Fixture that provides a fake clock
+
+    Returns:
+        FakeClock: The clock
+    """
+    return FakeClock()
+
+
+def test_token_bucket(clock):
+    """Tests requests beyond the limit wait for the bucket to refill
+
+    Args:
+        clock (FakeClock): Fake clock
+    """
+    limiter = RateLimiter(
+        {'search': (2, 60)}, clock=clock.time, sleep=clock.sleep)
+
+    for _ in range(3):
+        limiter.acquire('search')
+    limiter.acquire('core')
+
+    assert clock.sleeps == [pytest.approx(30)]
+
+
+def test_exhausted_limit(clock):
+    """Tests requests wait for the limit to reset once none remain
+
+    Args:
+        clock (FakeClock): Fake clock
+    """
+    limiter = RateLimiter(clock=clock.time, sleep=clock.sleep)
+
+    limiter.update('core', {
+        'X-RateLimit-Remaining': "0",
+        'X-RateLimit-Reset': str(int(clock.now) + 120),
+    })
+    limiter.acquire('core')
+    limiter.acquire('search')
+
+    assert clock.now == pytest.approx(1120)
+
+
+@pytest.mark.parametrize('status,headers,message,throttled', [
+    (429, {}, "", True),
+    (403, {'X-RateLimit-Remaining': "0"}, "", True),
+    (403, {'Retry-After': "60"}, "", True),
+    (403, {}, "You have exceeded a secondary rate limit", True),
+    (403, {'X-RateLimit-Remaining': "10"}, "Forbidden", False),
+    (422, {}, "Validation Failed", False),
+])
+def test_is_throttled(status, headers, message, throttled):
+    """Tests throttled responses are recognised
+
+    Args:
+        status (int): HTTP status code
+        headers (dict): Response headers
+        message (str): Error message
+        throttled (bool): Whether the response is throttled
+    """
+    assert is_throttled(status, headers, message) == throttled
+
+
+def test_pagination_resumes(fake_client, clock):
+    """Tests a search resumes after its requests are throttled
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+        clock (FakeClock): Fake clock
+    """
+    # pylint: disable=protected-access
+    fake_client._session = ThrottlingSession(
+        fake_client._session.issues, throttled=[2, 3])
+    fake_client.limiter = RateLimiter(clock=clock.time, sleep=clock.sleep)
+
+    numbers = [
+        issue['number'] for issue in IssueSearch(fake_client, "is:open")]
+
+    assert numbers == list(range(1, 251))
+    assert clock.now >= 1060
+
+
+def test_retries_exhausted(fake_client, clock):
+    """Tests requests throttled too many times raise an error
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+        clock (FakeClock): Fake clock
+    """
+    # pylint: disable=protected-access
+    fake_client._session = ThrottlingSession(
+        fake_client._session.issues, throttled=[1] * 3)
+    fake_client.limiter = RateLimiter(
+        retries=2, clock=clock.time, sleep=clock.sleep)
+
+    with pytest.raises(ApiError):
+        IssueSearch(fake_client, "is:open").total_count
@@ -0,0 +1,70 @@
+"""
+Tests the search module
+"""
+
+import pytest
+
+from gisrep.search import IssueSearch, ShardedSearch
+
+from .conftest import make_raw_issue
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_pages_in_order(fake_client, workers):
+    """Tests pages are yielded in order however many are fetched at once
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+        workers (int): Number of pages to fetch concurrently
+    """
+    search = IssueSearch(fake_client, "is:open", workers=workers)
+
+    numbers = [issue['number'] for issue in search]
+
+    assert numbers == list(range(1, 251))
+
+
+def test_first_page_reused(fake_client):
+    """Tests the first page is only fetched once
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    session = fake_client._session  # pylint: disable=protected-access
+    search = IssueSearch(fake_client, "is:open")
+
+    assert search.total_count == 250
+    assert search.page_count == 3
+    list(search)
+
+    pages = sorted(params['page'] for _, params, _ in session.requests)
+    assert pages == [1, 2, 3]
+
+
+def test_sharded_search(fake_client):
+    """Tests queries beyond the search API limit are split into shards
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    session = fake_client._session  # pylint: disable=protected-access
+    session.issues = [make_raw_issue(number) for number in range(2500)]
+    search = ShardedSearch(fake_client, "is:open")
+
+    numbers = [issue['number'] for issue in search]
+
+    assert search.total_count == 2500
+    assert len(search.shards()) > 1
+    assert numbers == list(range(2500))
+
+
+def test_unsharded_search(fake_client):
+    """Tests queries within the search API limit are not split
+
+    Args:
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    search = ShardedSearch(fake_client, "is:open")
+
+    assert len(search.shards()) == 1
+    assert len(list(search)) == 250
@@ -0,0 +1,105 @@
+"""
+Tests the snapshot module and the fetch command
+"""
+
+import gzip
+
+import pytest
+
+from gisrep.errors import GisrepError
+from gisrep.snapshot import Snapshot, write_snapshot
+
+from .conftest import make_raw_issue, run_gisrep
+
+
+def test_round_trip(tmpdir):
+    """Tests issues written to a snapshot are read back unchanged
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    path = str(tmpdir.join('issues.snap'))
+    issues = [make_raw_issue(number, labels=('bug',)) for number in range(5)]
+
+    count = write_snapshot(path, "is:open", iter(issues), [('user', 'name')])
+
+    snapshot = Snapshot(path)
+    assert count == 5
+    assert snapshot.query == "is:open"
+    assert snapshot.fields == {('user', 'name')}
+    assert list(snapshot) == issues
+
+
+def test_not_a_snapshot(tmpdir):
+    """Tests other files are rejected
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    text_file = tmpdir.join('issues.txt')
+    text_file.write("not a snapshot")
+    with pytest.raises(GisrepError):
+        Snapshot(str(text_file))
+
+    other_json = str(tmpdir.join('other.snap'))
+    with gzip.open(other_json, 'wt') as snapshot_file:
+        snapshot_file.write('{"format": "other"}\n')
+    with pytest.raises(GisrepError):
+        Snapshot(other_json)
+
+
+def test_fetch_and_report(tmpdir, fake_session):
+    """Tests reports from a snapshot match reports from a search, offline
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_session (FakeSession): Session serving fake search results
+    """
+    path = str(tmpdir.join('issues.snap'))
+    searched = run_gisrep('report', "is:open", '--no-cache')
+
+    result = run_gisrep('fetch', "is:open", '-o', path, '--no-cache')
+    assert result.exit_code == 0, result.output
+
+    del fake_session.requests[:]
+    replayed = run_gisrep('report', '--from-snapshot', path)
+    assert replayed.exit_code == 0, replayed.output
+    assert replayed.output == searched.output
+    assert fake_session.requests == []
+
+
+def test_report_missing_fields(tmpdir, large_snapshot):
+    """Tests templates needing attributes not in a snapshot are rejected
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        large_snapshot (str): Path of a snapshot of 5000 issues
+    """
+    template = tmpdir.join('names.txt.tplt')
+    template.write(
+        "{% for issue in issues %}{{ issue.user.name }}{% endfor %}")
+
+    result = run_gisrep(
+        'report', '--from-snapshot', large_snapshot,
+        '--external', str(template))
+
+    assert isinstance(result.exception, GisrepError)
+
+
+def test_large_report(large_snapshot):
+    """Tests publishing a large report grouped by label from a snapshot
+
+    Args:
+        large_snapshot (str): Path of a snapshot of 5000 issues
+    """
+    result = run_gisrep(
+        'report', '--from-snapshot', large_snapshot,
+        '--internal', 'list_by_labels.html')
+
+    issues = list(Snapshot(large_snapshot))
+    labels = set(
+        label['name'] for issue in issues for label in issue['labels'])
+    assert result.exit_code == 0, result.output
+    assert result.output.count("<h2>") == len(labels) + 1
+    assert result.output.count("<li>") == sum(
+        max(len(issue['labels']), 1) for issue in issues)
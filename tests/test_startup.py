@@ -0,0 +1,56 @@
+"""
+Tests subcommands only import the dependencies they need
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Prints the heavy dependencies imported after running gisrep
+RUN_GISREP = """
+import sys
+sys.argv = ['gisrep'] + sys.argv[1:]
+from gisrep.gisrep import main
+try:
+    main()
+except SystemExit:
+    pass
+heavy = ['github', 'keyring', 'requests', 'jinja2']
+print(' '.join(name for name in heavy if name in sys.modules))
+"""
+
+
+def imported_dependencies(*args):
+    """Runs gisrep in a fresh interpreter
+
+    Args:
+        *args: Arguments passed to gisrep
+
+    Returns:
+        set: Heavy dependencies that were imported
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c', RUN_GISREP] + list(args),
+        universal_newlines=True)
+    return set(output.splitlines()[-1].split())
+
+
+@pytest.mark.parametrize('args', [
+    ['--help'],
+    ['init', '--help'],
+    ['report', '--help'],
+])
+def test_help_is_light(args):
+    """Tests help imports none of the heavy dependencies
+
+    Args:
+        args (list): Arguments passed to gisrep
+    """
+    assert imported_dependencies(*args) == set()
+
+
+def test_templates_is_light():
+    """Tests listing templates only imports jinja2
+    """
+    assert imported_dependencies('templates') == {'jinja2'}
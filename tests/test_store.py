@@ -0,0 +1,142 @@
+"""
+Tests the store module and the sync command
+"""
+
+import pytest
+
+from gisrep.errors import GisrepError
+from gisrep.store import IssueStore
+
+from .conftest import make_raw_issue, make_raw_issues, run_gisrep
+
+
+@pytest.fixture
+def store(tmpdir):
+    """Fixture that provides a database of 100 issues
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+
+    Returns:
+        IssueStore: The database
+    """
+    issue_store = IssueStore(str(tmpdir.join('issues.sqlite')))
+    issue_store.add(make_raw_issues(100))
+    yield issue_store
+    issue_store.close()
+
+
+def _numbers(items):
+    return [item['number'] for item in items]
+
+
+@pytest.mark.parametrize('query,matches', [
+    ("repo:owner/repo", lambda issue: True),
+    ("repo:owner/other", lambda issue: False),
+    ("is:open", lambda issue: issue['state'] == 'open'),
+    ("state:closed", lambda issue: issue['state'] == 'closed'),
+    ("is:pr", lambda issue: False),
+    ("label:bug", lambda issue: 'bug' in _labels(issue)),
+    ("label:bug,docs", lambda issue: {'bug', 'docs'} & _labels(issue)),
+    ("label:bug label:docs", lambda issue: {'bug', 'docs'} <= _labels(issue)),
+    ("-label:bug", lambda issue: 'bug' not in _labels(issue)),
+    ("no:label", lambda issue: not issue['labels']),
+    ('milestone:"v2.0"', lambda issue: _milestone(issue) == "v2.0"),
+    ("no:milestone", lambda issue: issue['milestone'] is None),
+    ("assignee:user1", lambda issue: 'user1' in _assignees(issue)),
+    ("no:assignee", lambda issue: not issue['assignees']),
+    ("author:user2", lambda issue: issue['user']['login'] == 'user2'),
+    ("is:open Issue 4", lambda issue: (
+        issue['state'] == 'open' and '4' in issue['title'])),
+])
+def test_search(store, query, matches):
+    """Tests qualifiers are evaluated as Github would
+
+    Args:
+        store (IssueStore): Database of 100 issues
+        query (str): The search query
+        matches (function): Checks if a raw issue matches the query
+    """
+    expected = [
+        issue['number'] for issue in make_raw_issues(100) if matches(issue)]
+    assert _numbers(store.search(query)) == expected
+
+
+def test_unsupported_qualifier(store):
+    """Tests queries using unsupported qualifiers are rejected
+
+    Args:
+        store (IssueStore): Database of 100 issues
+    """
+    with pytest.raises(GisrepError):
+        store.search("reactions:>10")
+
+
+def test_update(store):
+    """Tests updated issues replace their labels and assignees
+
+    Args:
+        store (IssueStore): Database of 100 issues
+    """
+    store.add([make_raw_issue(1, labels=('security',), state='closed')])
+
+    assert 1 in _numbers(store.search("label:security is:closed"))
+    assert 1 not in _numbers(store.search("label:bug"))
+    assert 1 in _numbers(store.search("no:assignee"))
+
+
+def test_sync(tmpdir, fake_client):
+    """Tests syncs only fetch issues updated since the last sync
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_client (GithubClient): Client for a fake Github API
+    """
+    issues = fake_client._session.issues  # pylint: disable=protected-access
+    issue_store = IssueStore(str(tmpdir.join('issues.sqlite')))
+
+    assert issue_store.sync(fake_client, "repo:owner/repo") == 250
+    last = issue_store.last_synced("repo:owner/repo")
+    assert last == max(issue['updated_at'] for issue in issues)
+
+    # Only the most recently updated issue is fetched again
+    assert issue_store.sync(fake_client, "repo:owner/repo") == 1
+
+    # Updated issues are fetched (with the last issue seen)
+    issues[0] = make_raw_issue(
+        1, state='closed', updated_at="2019-01-01T00:00:00Z")
+    assert issue_store.sync(fake_client, "repo:owner/repo") == 2
+    assert _numbers(issue_store.search("is:closed")) == [1]
+    assert len(issue_store.search("repo:owner/repo")) == 250
+
+
+def test_sync_and_report(tmpdir, fake_session):
+    """Tests local reports match reports from a search, offline
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+        fake_session (FakeSession): Session serving fake search results
+    """
+    db = str(tmpdir.join('issues.sqlite'))
+    searched = run_gisrep('report', "repo:owner/repo", '--no-cache')
+
+    result = run_gisrep('sync', "repo:owner/repo", '--db', db, '--no-cache')
+    assert result.exit_code == 0, result.output
+
+    del fake_session.requests[:]
+    local = run_gisrep('report', "repo:owner/repo", '--local', '--db', db)
+    assert local.exit_code == 0, local.output
+    assert local.output == searched.output
+    assert fake_session.requests == []
+
+
+def _labels(issue):
+    return set(label['name'] for label in issue['labels'])
+
+
+def _milestone(issue):
+    return issue['milestone']['title'] if issue['milestone'] else None
+
+
+def _assignees(issue):
+    return set(assignee['login'] for assignee in issue['assignees'])
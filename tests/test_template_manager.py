@@ -4,11 +4,13 @@ Tests for the template_manager module
 
 import os
 
+from jinja2 import Environment
 import pytest
 
 from gisrep.errors import GisrepError
 from gisrep.templates.template_manager import (
-    ExternalTemplateManager, InternalTemplateManager)
+    TEMPLATES_DIR, ExternalTemplateManager, InternalTemplateManager,
+    TemplateManager, find_issue_fields)
 
 TEST_DATA_DIR = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
@@ -135,3 +137,109 @@ def assert_external_list(manager):
     # Assert list
     assert len(templates) == 1
     assert 'test_template' in templates
+
+
+def test_internal_fields(
+        internal_manager):  # pylint: disable=redefined-outer-name
+    """Tests finding the issue attributes used by internal templates
+
+    Args:
+        internal_manager (InternalTemplateManager): The template manager
+    """
+    assert internal_manager.get_fields('simple_report.md') == {
+        ('title',), ('number',)}
+    assert internal_manager.get_fields('list_by_labels.html') == {
+        ('title',), ('number',), ('labels', 'name'), ('milestone', 'title'),
+        ('assignees', 'login')}
+
+
+def test_find_issue_fields():
+    """Tests attributes are followed through loops over issues and lists
+    """
+    ast = Environment().parse(
+        "{% for i in issues %}"
+        "{{ i.user.login }}{{ i.created_at.year }}"
+        "{% for label in i.labels %}{{ label.name }}{% endfor %}"
+        "{% endfor %}"
+        "{% for label in labels %}{{ label.color }}{% endfor %}"
+        "{% macro print_issue(issue) %}{{ issue.title }}{% endmacro %}")
+
+    assert find_issue_fields(ast) == {
+        ('user',), ('user', 'login'), ('created_at',),
+        ('created_at', 'year'), ('labels',), ('labels', 'name'), ('title',)}
+
+
+def test_stream(internal_manager):  # pylint: disable=redefined-outer-name
+    """Tests streamed reports match rendered reports and consume issues lazily
+
+    Args:
+        internal_manager (InternalTemplateManager): The template manager
+    """
+    consumed = []
+
+    def issues():
+        for issue in FAKE_ISSUES:
+            consumed.append(issue)
+            yield issue
+
+    chunks = internal_manager.stream(INTERNAL_TEMPLATE_TAG, issues())
+    first = next(chunks)
+
+    assert len(consumed) == 1
+    assert first + ''.join(chunks) == internal_manager.generate(
+        INTERNAL_TEMPLATE_TAG, FAKE_ISSUES)
+
+
+def test_stream_with_context(
+        external_manager):  # pylint: disable=redefined-outer-name
+    """Tests streamed issues are collected for templates with custom logic
+
+    Args:
+        external_manager (ExternalTemplateManager): The template manager
+    """
+    report = ''.join(external_manager.stream(
+        EXTERNAL_TEMPLATE_TAG, iter(FAKE_ISSUES)))
+
+    assert report.split('\n')[:2] == ["123", "test"]
+
+
+def test_bytecode_cache(tmpdir):
+    """Tests compiled templates are cached and reused by new managers
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    cache_dir = str(tmpdir)
+    first = InternalTemplateManager(cache_dir).generate(
+        INTERNAL_TEMPLATE_TAG, FAKE_ISSUES)
+    cached = os.listdir(os.path.join(cache_dir, TEMPLATES_DIR))
+    assert len(cached) == 1
+
+    second = InternalTemplateManager(cache_dir).generate(
+        INTERNAL_TEMPLATE_TAG, FAKE_ISSUES)
+    assert second == first
+    assert os.listdir(os.path.join(cache_dir, TEMPLATES_DIR)) == cached
+
+
+def test_module_reloaded_when_modified(tmpdir):
+    """Tests template modules are imported once, unless they are modified
+
+    Args:
+        tmpdir (py.path.local): Temporary pytest directory
+    """
+    tmpdir.join('report.txt.tplt').write("{{ value }}")
+    module = tmpdir.join('report.txt.py')
+    module.write("def get_context(issues):\n    return {'value': 1}\n")
+    os.utime(str(module), (1, 1))
+    manager = ExternalTemplateManager(str(tmpdir))
+
+    assert manager.generate('report.txt', []) == "1"
+    imported = TemplateManager._modules[  # pylint: disable=protected-access
+        str(module)]
+    assert manager.generate('report.txt', []) == "1"
+    assert TemplateManager._modules[  # pylint: disable=protected-access
+        str(module)] is imported
+
+    module.write("def get_context(issues):\n    return {'value': 2}\n")
+    os.utime(str(module), (2, 2))
+    assert manager.generate('report.txt', []) == "2"